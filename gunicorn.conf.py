@@ -0,0 +1,25 @@
+"""
+gunicorn settings (see Procfile).
+
+Workers run requests in threads (gthread) so a worker keeps serving while
+other requests wait on the database or hold a live leaderboard stream open.
+The project runs on Django 2.2, which has no ASGI handler or async views;
+threaded workers are how it gets more concurrent connections per worker.
+Set GUNICORN_WORKER_CLASS=sync to go back to one request per worker.
+
+Each thread keeps its own database connection open for DB_CONN_MAX_AGE
+seconds, so the app holds up to WEB_CONCURRENCY x GUNICORN_THREADS
+connections per database (16 with the defaults), or WEB_CONCURRENCY x
+DB_POOL_SIZE with the pooled PostgreSQL backend. Keep that, plus one-off
+dynos and management commands, below the connection limit of the database
+plan.
+"""
+import os
+
+workers = int(os.environ.get('WEB_CONCURRENCY', 2))
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+# gunicorn turns sync workers with several threads into gthread workers
+threads = int(os.environ.get('GUNICORN_THREADS', 8)) if worker_class == 'gthread' else 1
+# a gthread worker is only killed when it stops responding, not for a long request
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', 5))
@@ -1,5 +1,9 @@
 from django.contrib import admin
-from .models import Quiz, Question, Choice, Player, Timer
+from django.db import transaction
+from django.db.models import Count
+
+from . import counters, leaderboards
+from .models import Quiz, Question, Choice, Player, ArchivedPlayer
 
 # Register your models here.
 
@@ -13,13 +17,9 @@ class ChoiceInline(admin.TabularInline):
     model = Choice
 
 
-class TimerInline(admin.TabularInline):
-    model = Timer
-
-
 @admin.register(Quiz)
 class QuizAdmin(admin.ModelAdmin):
-    list_display = ('topic', 'upvotes', 'downvotes')
+    list_display = ('topic', 'upvotes', 'downvotes', 'finisher_count')
     inlines = [QuestionInline]
 
 
@@ -41,11 +41,32 @@ class ChoiceAdmin(admin.ModelAdmin):
 class PlayerAdmin(admin.ModelAdmin):
     list_display = ('name', 'quiz', 'is_achieved', 'is_failed', 'time')
     list_filter = ('name', 'quiz', 'is_achieved', 'is_failed')
-    fields = ['name', ('quiz', 'selected_difficulty'), ('current_question', 'position'),
-              ('is_playing', 'is_achieved', 'is_failed', 'has_vote')]
-    inlines = [TimerInline]
-
-
-@admin.register(Timer)
-class TimerAdmin(admin.ModelAdmin):
-    list_display = ('start_point', 'end_point', 'player')
+    fieldsets = [
+        (None, {'fields': ['name', ('quiz', 'selected_difficulty'), ('current_question', 'position'),
+                           ('is_playing', 'is_achieved', 'is_failed', 'has_vote')]}),
+        ('Timer', {'fields': [('start_point', 'end_point', 'time_limit'), ('start_monotonic', 'clock_id')]}),
+    ]
+
+    # there is no delete signal on Player, keep the finisher counts and the leaderboards in sync here
+    def delete_model(self, request, obj):
+        leaderboards.discard(obj)
+        with transaction.atomic():
+            super().delete_model(request, obj)
+            if obj.is_achieved:
+                counters.remove_finisher(obj.quiz_id)
+
+    def delete_queryset(self, request, queryset):
+        finishers = queryset.filter(is_achieved=True)
+        for player in finishers.only('id', 'quiz_id'):
+            leaderboards.discard(player)
+        with transaction.atomic():
+            finisher_counts = list(finishers.values_list('quiz_id').annotate(count=Count('id')).order_by())
+            super().delete_queryset(request, queryset)
+            for quiz_id, count in finisher_counts:
+                counters.remove_finisher(quiz_id, count)
+
+
+@admin.register(ArchivedPlayer)
+class ArchivedPlayerAdmin(admin.ModelAdmin):
+    list_display = ('name', 'quiz', 'selected_difficulty', 'outcome', 'time')
+    list_filter = ('quiz', 'outcome')
@@ -3,3 +3,7 @@ from django.apps import AppConfig
 
 class QuizerGameConfig(AppConfig):
     name = 'quizer_game'
+
+    def ready(self):
+        # connect signal receivers
+        from . import content, counters, database, leaderboards, page_cache  # noqa: F401
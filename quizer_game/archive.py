@@ -0,0 +1,58 @@
+"""
+Archive of finished players.
+
+Failed and timed out players never show on a leaderboard, but without an
+archive they stay in the Player table forever. `archive_players` moves the
+ones that finished more than PLAYER_ARCHIVE_AFTER_DAYS days ago into the
+compact ArchivedPlayer table in batches, so the Player table only keeps
+games in progress, recent games and leaderboard rows. `purge_archive`
+deletes archived players older than PLAYER_ARCHIVE_RETENTION_DAYS days.
+
+The fixture players of PLAYERS_FOR_TESTING are reset by each of their games
+instead of being created, so they are never archived.
+"""
+from django.conf import settings
+from django.db import transaction
+
+from .models import Player, ArchivedPlayer, PLAYERS_FOR_TESTING
+from . import clock
+
+BATCH_SIZE = 1000
+DEFAULT_ARCHIVE_AFTER_DAYS = 7
+DEFAULT_RETENTION_DAYS = 365
+DAY = 24 * 3600 * 1000          # milliseconds
+
+
+def _days_ago(days, now) -> int:
+    return (clock.now_ms() if now is None else now) - days * DAY
+
+
+def archive_players(days=None, now=None, batch_size=BATCH_SIZE) -> int:
+    """
+    Move the players who didn't reach the finish line of a game finished
+    `days` days before `now` to the archive, return the number of players moved
+    """
+    if days is None:
+        days = getattr(settings, 'PLAYER_ARCHIVE_AFTER_DAYS', DEFAULT_ARCHIVE_AFTER_DAYS)
+    finished = Player.objects.filter(is_playing=False, is_achieved=False, end_point__lte=_days_ago(days, now))
+    finished = finished.exclude(name__in=PLAYERS_FOR_TESTING).order_by('end_point')
+    total = 0
+    while True:
+        with transaction.atomic():
+            players = list(finished.only('quiz_id', 'name', 'selected_difficulty', 'is_timeout', 'correct_answer',
+                                         'wrong_answer', 'time', 'end_point')[:batch_size])
+            if not players:
+                return total
+            ArchivedPlayer.objects.bulk_create([ArchivedPlayer.from_player(player) for player in players])
+            Player.objects.filter(id__in=[player.id for player in players]).delete()
+        total += len(players)
+
+
+def purge_archive(days=None, now=None) -> int:
+    """Delete archived players older than `days` days, return the number of rows deleted"""
+    if days is None:
+        days = getattr(settings, 'PLAYER_ARCHIVE_RETENTION_DAYS', DEFAULT_RETENTION_DAYS)
+    if not days:
+        return 0
+    deleted, _ = ArchivedPlayer.objects.filter(end_point__lte=_days_ago(days, now)).delete()
+    return deleted
@@ -0,0 +1,37 @@
+"""
+Clocks of the game timer.
+
+Timer points are stored in milliseconds since the epoch. A game also keeps
+the reading of the monotonic clock when it started, so when the game ends
+on a server with the same monotonic clock (same machine, same boot) its
+duration doesn't change if the wall clock is adjusted in the meantime.
+"""
+import os
+import socket
+import time
+
+BOOT_ID_FILE = '/proc/sys/kernel/random/boot_id'
+
+
+def _clock_id() -> str:
+    """Identify the monotonic clock of this machine since its last boot"""
+    if os.path.exists(BOOT_ID_FILE):
+        with open(BOOT_ID_FILE) as boot_id_file:
+            boot = boot_id_file.read().strip()
+    else:
+        # approximate boot time, the same for every process of this boot
+        boot = str(int(time.time() - time.monotonic()) // 10)
+    return f'{socket.gethostname()}:{boot}'[:64]
+
+
+CLOCK_ID = _clock_id()
+
+
+def now_ms() -> int:
+    """Milliseconds since the epoch (wall clock)"""
+    return int(time.time() * 1000)
+
+
+def monotonic_ms() -> int:
+    """Milliseconds of the monotonic clock identified by CLOCK_ID"""
+    return int(time.monotonic() * 1000)
@@ -0,0 +1,164 @@
+"""
+Cache of quiz content (questions and choices) used during gameplay.
+
+Quiz content almost never changes while games are running, so every
+process keeps the content of recently played quizzes in a small LRU as
+read-only tuples. When the QUIZ_CONTENT_CACHE setting names a Django cache
+alias, that cache is used as a second level shared by all processes.
+
+Content is invalidated by `invalidate()` (called after bulk edits of a
+quiz) and by the signals below when a quiz is saved or deleted or one of
+its questions or choices is saved. With a shared cache, invalidating
+changes the version of the quiz kept in that cache and every process
+checks the version before serving its LRU entry, so an edit is seen by
+all processes at once. Without one, entries of the in-process LRU expire
+after QUIZ_CONTENT_CACHE_TIMEOUT seconds, which bounds how long another
+process can serve content that was edited elsewhere.
+"""
+import threading
+import time
+import uuid
+from collections import OrderedDict, namedtuple
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from django.shortcuts import get_object_or_404
+
+from .models import Quiz, Question, Choice, quiz_tree_prefetch
+
+DEFAULT_SIZE = 128
+DEFAULT_TIMEOUT = 300           # seconds
+
+ChoiceContent = namedtuple('ChoiceContent', ['id', 'text', 'value'])
+QuestionContent = namedtuple('QuestionContent', ['id', 'number', 'text', 'choices'])
+
+
+class QuizContent(namedtuple('QuizContent', ['id', 'topic', 'questions'])):
+    """Questions of a quiz ordered by number, each with its choices"""
+    __slots__ = ()
+
+    def question(self, question_id):
+        """Return the question with `question_id` or None"""
+        for question in self.questions:
+            if question.id == question_id:
+                return question
+        return None
+
+    def question_by_number(self, number):
+        """Return the question with `number` or None"""
+        for question in self.questions:
+            if question.number == number:
+                return question
+        return None
+
+    def choice_value(self, choice_id):
+        """Return the value of a choice of this quiz or None if there is no such choice"""
+        try:
+            choice_id = int(choice_id)
+        except (TypeError, ValueError):
+            return None
+        for question in self.questions:
+            for choice in question.choices:
+                if choice.id == choice_id:
+                    return choice.value
+        return None
+
+
+def load(quiz_id) -> QuizContent:
+    """Read the content of a quiz from the database (three queries)"""
+    quiz = get_object_or_404(Quiz.objects.prefetch_related(*quiz_tree_prefetch()), pk=quiz_id)
+    questions = tuple(QuestionContent(question.id, question.number, question.text,
+                                      tuple(ChoiceContent(choice.id, choice.text, choice.value)
+                                            for choice in question.choice_set.all()))
+                      for question in quiz.question_set.all())
+    return QuizContent(quiz.id, quiz.topic, questions)
+
+
+_entries = OrderedDict()
+_lock = threading.Lock()
+
+
+def _shared_cache():
+    alias = getattr(settings, 'QUIZ_CONTENT_CACHE', None)
+    return caches[alias] if alias else None
+
+
+def _cache_key(quiz_id, version) -> str:
+    return f'quizer_game:quiz_content:{quiz_id}:{version}'
+
+
+def _version_key(quiz_id) -> str:
+    return f'quizer_game:quiz_content_version:{quiz_id}'
+
+
+def _version(shared_cache, quiz_id) -> str:
+    """Return the current version of the content of a quiz in the shared cache"""
+    version = shared_cache.get(_version_key(quiz_id))
+    if version is None:
+        shared_cache.add(_version_key(quiz_id), uuid.uuid4().hex, None)
+        version = shared_cache.get(_version_key(quiz_id))
+    return version
+
+
+def _timeout() -> int:
+    return getattr(settings, 'QUIZ_CONTENT_CACHE_TIMEOUT', DEFAULT_TIMEOUT)
+
+
+def get(quiz_id) -> QuizContent:
+    """Return the content of a quiz, raise Http404 if the quiz doesn't exist"""
+    now = time.monotonic()
+    shared_cache = _shared_cache()
+    version = _version(shared_cache, quiz_id) if shared_cache else None
+    with _lock:
+        entry = _entries.get(quiz_id)
+        if entry is not None and entry[0] > now and entry[1] == version:
+            _entries.move_to_end(quiz_id)
+            return entry[2]
+
+    content = shared_cache.get(_cache_key(quiz_id, version)) if shared_cache else None
+    if content is None:
+        content = load(quiz_id)
+        if shared_cache:
+            shared_cache.set(_cache_key(quiz_id, version), content, _timeout())
+
+    with _lock:
+        _entries[quiz_id] = (now + _timeout(), version, content)
+        _entries.move_to_end(quiz_id)
+        while len(_entries) > getattr(settings, 'QUIZ_CONTENT_CACHE_SIZE', DEFAULT_SIZE):
+            _entries.popitem(last=False)
+    return content
+
+
+def invalidate(quiz_id) -> None:
+    """Forget the cached content of a quiz in this process and, by a new version, in the others"""
+    with _lock:
+        _entries.pop(quiz_id, None)
+    shared_cache = _shared_cache()
+    if shared_cache:
+        shared_cache.set(_version_key(quiz_id), uuid.uuid4().hex, None)
+
+
+def clear() -> None:
+    """Forget the content of every quiz cached by this process"""
+    with _lock:
+        _entries.clear()
+
+
+@receiver(post_save, sender=Quiz)
+@receiver(post_delete, sender=Quiz)
+def quiz_changed_callback(sender, instance, **kwargs):
+    invalidate(instance.id)
+
+
+@receiver(post_save, sender=Question)
+def question_changed_callback(sender, instance, **kwargs):
+    invalidate(instance.quiz_id)
+
+
+@receiver(post_save, sender=Choice)
+def choice_changed_callback(sender, instance, **kwargs):
+    questions = Question.objects.filter(pk=instance.question_id)
+    for quiz_id in questions.values_list('quiz_id', flat=True):
+        invalidate(quiz_id)
@@ -0,0 +1,51 @@
+"""
+Stored counters of Quiz.
+
+`Quiz.finisher_count`, `Quiz.upvotes` and `Quiz.downvotes` are changed with
+F() expressions, so concurrent games and votes never overwrite each other's
+updates or other fields of the quiz. Each update also moves `updated_at`,
+the validator of the pages showing the counters. `rebuild()` recounts
+everything from the players table (see the `rebuild_counters` management
+command).
+
+There is no delete signal on Player: it would make Django load and delete
+players one by one when a quiz is deleted. Views and the admin call
+`remove_finisher` themselves when they delete players, anything else (the
+archive) relies on `rebuild()`.
+"""
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import Quiz, Player
+
+
+def add_finisher(quiz_id) -> None:
+    Quiz.objects.filter(pk=quiz_id).update(finisher_count=F('finisher_count') + 1, updated_at=timezone.now())
+
+
+def remove_finisher(quiz_id, count=1) -> None:
+    Quiz.objects.filter(pk=quiz_id).update(finisher_count=F('finisher_count') - count, updated_at=timezone.now())
+
+
+def vote(quiz_id, player_id, is_upvote) -> bool:
+    """
+    Use the vote of a player, return False if the player has already voted
+    """
+    field = 'upvotes' if is_upvote else 'downvotes'
+    with transaction.atomic():
+        # only one request can flip has_vote, so a player can't vote twice
+        voted = Player.objects.filter(pk=player_id, quiz_id=quiz_id, has_vote=True).update(
+            has_vote=False, updated_at=timezone.now())
+        if voted:
+            Quiz.objects.filter(pk=quiz_id).update(**{field: F(field) + 1}, updated_at=timezone.now())
+    return bool(voted)
+
+
+def rebuild() -> int:
+    """Recount the finishers of every quiz, return the number of quizzes updated"""
+    finishers = Player.objects.filter(quiz=OuterRef('pk'), is_achieved=True)
+    finishers = finishers.order_by().values('quiz').annotate(total=Count('pk')).values('total')
+    return Quiz.objects.update(finisher_count=Coalesce(Subquery(finishers), 0), updated_at=timezone.now())
+
@@ -0,0 +1,21 @@
+"""
+Per-connection database tuning.
+
+SQLite connections switch to write-ahead logging, so readers don't block
+the writer, with synchronous=NORMAL, which is safe with WAL and skips an
+fsync per commit. Concurrent writers wait up to DB_SQLITE_BUSY_TIMEOUT
+seconds for the lock (the `timeout` connection option set in settings)
+instead of failing with "database is locked".
+"""
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+
+@receiver(connection_created)
+def connection_created_callback(sender, connection, **kwargs):
+    if connection.vendor != 'sqlite' or not getattr(settings, 'DB_SQLITE_WAL', True):
+        return
+    with connection.cursor() as cursor:
+        cursor.execute('PRAGMA journal_mode=WAL')
+        cursor.execute('PRAGMA synchronous=NORMAL')
@@ -0,0 +1,208 @@
+"""
+Game turn engine used by `views.update_game` and the gameplay API.
+
+A turn is loaded with a single query (the player), the question and
+the chosen choice come from the quiz content cache, and the turn is played
+in memory and written back inside one transaction. When the game state
+store is enabled, games in progress are read from and written to the
+store instead and only the last turn is written to the database.
+
+`play_batch` plays several buffered answers of a player with the same rules
+and writes the game once.
+"""
+from django.db import transaction
+from django.http import Http404
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+
+from . import content, counters, game_state, live
+from .models import Player
+from .models import DIFFICULTY, CHOICE_VALUE, POSITION
+
+# outcomes of a turn
+NEXT_QUESTION = 'next'
+ACHIEVED = 'achieved'
+FAILED = 'failed'
+TIMEOUT = 'timeout'
+
+# player fields a turn can change
+TURN_FIELDS = ['current_question', 'position', 'is_playing', 'is_failed', 'is_achieved',
+               'is_timeout', 'correct_answer', 'wrong_answer', 'time', 'end_point', 'expires_at',
+               'updated_at']
+
+
+class GameOver(ValueError):
+    """Raised when a turn is played on a game that has already ended"""
+
+
+class Turn:
+    """State needed to play one answer of a player"""
+
+    def __init__(self, player, choice_value, next_question):
+        self.player = player
+        self.choice_value = choice_value
+        self.next_question = next_question
+
+    @property
+    def is_correct(self) -> bool:
+        return self.choice_value == CHOICE_VALUE['correct']
+
+
+def load_turn(quiz_id, player_id, choice_id) -> Turn:
+    """
+    Load everything a turn needs with one query and the quiz content cache,
+    raise GameOver if the game of the player has ended
+    """
+    player = game_state.load(quiz_id, player_id)
+    if player is None:
+        player = get_object_or_404(Player, pk=player_id, quiz_id=quiz_id)
+    if not player.is_playing:
+        raise GameOver('The game is over')
+    quiz_content = content.get(quiz_id)
+    choice_value = quiz_content.choice_value(choice_id)
+    if choice_value is None:
+        raise Http404('Choice does not exist')
+    question = quiz_content.question(player.current_question_id)
+    next_question = None
+    if question is not None:
+        next_question = quiz_content.question_by_number(question.number + 1)
+    return Turn(player, choice_value, next_question)
+
+
+def update_player_position(turn) -> None:
+    """Move the player according to the chosen choice (in memory, nothing is saved)"""
+    player = turn.player
+    if turn.is_correct:
+        player.correct_answer += 1
+        if player.position < POSITION['max']:
+            player.move_forward()
+    else:
+        player.wrong_answer += 1
+        if player.selected_difficulty > DIFFICULTY['easy']:
+            if player.position > POSITION['min']:
+                player.move_backward()
+
+
+def apply_turn(turn, end_point=None) -> str:
+    """
+    Play a turn in memory and return its outcome, the answer time is read
+    from the timer unless `end_point` (milliseconds since the epoch) is given
+    """
+    player = turn.player
+    if end_point is None:
+        player.stop_timer(commit=False)
+    else:
+        player.end_point = end_point
+
+    # check time for hard level
+    if player.selected_difficulty == DIFFICULTY['hard'] and player.time_duration >= player.time_limit:
+        player.is_timeout = True
+        outcome = TIMEOUT
+    else:
+        update_player_position(turn)
+
+        # check if player reaches the finish line or not
+        if player.position == POSITION['max']:
+            player.is_achieved = True
+            outcome = ACHIEVED
+        elif player.position < POSITION['max'] and turn.next_question is None:
+            player.is_failed = True
+            outcome = FAILED
+        else:
+            # change to next question
+            if player.position < POSITION['max']:
+                player.current_question_id = turn.next_question.id
+            outcome = NEXT_QUESTION
+
+    if outcome != NEXT_QUESTION:
+        player.is_playing = False
+        player.time = player.time_duration
+    player.refresh_expiry()
+    return outcome
+
+
+def turn_values(player) -> dict:
+    """Return the TURN_FIELDS of `player` as keyword arguments of `QuerySet.update`"""
+    attnames = (Player._meta.get_field(name).attname for name in TURN_FIELDS)
+    return {attname: getattr(player, attname) for attname in attnames}
+
+
+def save_turn(player, outcome) -> None:
+    """
+    Write the state of `player` after a turn with `outcome`, raise GameOver
+    if the game was ended meanwhile (by another request or by expiry)
+    """
+    if outcome == NEXT_QUESTION and game_state.enabled():
+        game_state.save(player)
+        return
+
+    game_state.delete(player.id)
+    playing = Player.objects.filter(pk=player.id, is_playing=True)
+    with transaction.atomic():
+        if outcome == NEXT_QUESTION:
+            # a game ended meanwhile (e.g. by expire_games) must stay ended
+            player.updated_at = timezone.now()
+            if not playing.update(**turn_values(player)):
+                raise GameOver('The game is over')
+            return
+        # only one request can end a game, so a finisher is counted once
+        if not playing.update(is_playing=False):
+            raise GameOver('The game is over')
+        player.save(update_fields=TURN_FIELDS)
+        if outcome == ACHIEVED:
+            counters.add_finisher(player.quiz_id)
+            transaction.on_commit(lambda: live.publish_finisher(player))
+
+
+def play_turn(turn) -> str:
+    """Apply a turn, save it and return its outcome"""
+    outcome = apply_turn(turn)
+    save_turn(turn.player, outcome)
+    return outcome
+
+
+def play_batch(quiz_id, player_id, answers):
+    """
+    Play an ordered batch of answers, dicts with question_number, choice_id
+    and client_timestamp, and save the game once. Return the player, the
+    outcome of the last answer played and the number of answers played.
+
+    Answers after the end of the game are ignored. A ValueError is raised,
+    and nothing is saved, if an answer is not for the current question.
+    Games are timed with the server clock only; client timestamps are
+    accepted but never change the recorded time, so a buffered batch can't
+    shorten the time or stretch the time limit.
+    """
+    with transaction.atomic():
+        player = game_state.load(quiz_id, player_id)
+        if player is None:
+            player = get_object_or_404(Player.objects.select_for_update(), pk=player_id, quiz_id=quiz_id)
+        if not player.is_playing:
+            raise GameOver('The game is over')
+        if not answers:
+            raise ValueError('No answers')
+        quiz_content = content.get(quiz_id)
+
+        player.stop_timer(commit=False)
+        server_time = player.end_point
+        outcome, played = NEXT_QUESTION, 0
+        for answer in answers:
+            question = quiz_content.question(player.current_question_id)
+            try:
+                number, choice_id = int(answer['question_number']), int(answer['choice_id'])
+            except (KeyError, TypeError, ValueError):
+                raise ValueError(f'Invalid answer {answer!r}')
+            if question is None or number != question.number:
+                raise ValueError(f'Answer to question {number} is out of order')
+            choice_values = {choice.id: choice.value for choice in question.choices}
+            if choice_id not in choice_values:
+                raise ValueError(f'Choice {choice_id} is not a choice of question {number}')
+
+            next_question = quiz_content.question_by_number(number + 1)
+            outcome = apply_turn(Turn(player, choice_values[choice_id], next_question), end_point=server_time)
+            played += 1
+            if outcome != NEXT_QUESTION:
+                break
+
+        save_turn(player, outcome)
+    return player, outcome, played
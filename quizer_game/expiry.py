@@ -0,0 +1,59 @@
+"""
+Server side expiry of games in progress.
+
+Every game in progress has an `expires_at` deadline: the time limit of a
+hard game, or GAME_IDLE_TIMEOUT seconds after the last answer of an easy
+or medium game. `expire_games` finds the games past their deadline with
+the player_expires_idx index, so each run only reads the expiring rows,
+and marks them in batches: hard games timed out, other games failed.
+"""
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Player, DIFFICULTY
+from . import clock, game_state
+
+BATCH_SIZE = 500
+
+
+def _refresh_cached(player_ids, now) -> list:
+    """
+    Copy the deadline of games continued in the game state cache to their
+    rows and return the ids of the games that did expire
+    """
+    cached = game_state.expires_at(player_ids)
+    alive = {player_id: deadline for player_id, deadline in cached.items()
+             if deadline is not None and deadline > now}
+    if alive:
+        players = [Player(id=player_id, expires_at=deadline) for player_id, deadline in alive.items()]
+        Player.objects.bulk_update(players, ['expires_at'])
+    return [player_id for player_id in player_ids if player_id not in alive]
+
+
+def expire_games(now=None, batch_size=BATCH_SIZE) -> dict:
+    """
+    Finish the games in progress whose deadline is before `now`
+    (milliseconds since the epoch) and return the number of games timed out
+    and failed
+    """
+    now = clock.now_ms() if now is None else now
+    expired = Player.objects.filter(is_playing=True, expires_at__lte=now).order_by('expires_at')
+    result = {'timeout': 0, 'failed': 0}
+
+    while True:
+        batch = list(expired.values_list('id', 'selected_difficulty')[:batch_size])
+        if not batch:
+            return result
+        player_ids = _refresh_cached([player_id for player_id, _ in batch], now)
+        hard_ids = [player_id for player_id, difficulty in batch
+                    if difficulty == DIFFICULTY['hard'] and player_id in player_ids]
+        other_ids = [player_id for player_id in player_ids if player_id not in hard_ids]
+
+        with transaction.atomic():
+            result['timeout'] += Player.objects.filter(id__in=hard_ids, is_playing=True).update(
+                is_playing=False, is_timeout=True, time=F('time_limit'),
+                end_point=F('expires_at'), expires_at=None, updated_at=timezone.now())
+            result['failed'] += Player.objects.filter(id__in=other_ids, is_playing=True).update(
+                is_playing=False, is_failed=True, expires_at=None, updated_at=timezone.now())
+        game_state.delete_many(player_ids)
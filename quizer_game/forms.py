@@ -1,5 +1,8 @@
 from django import forms
-from .models import Quiz, Question, Choice
+from .models import Quiz, Question, Choice, CHOICE_VALUE
+
+QUESTIONS_PER_QUIZ = 20
+CHOICES_PER_QUESTION = 4
 
 # class QuizForm(forms.Form):
 #     topic = forms.CharField(max_length=200)
@@ -33,5 +36,29 @@ class QuestionModelForm(forms.ModelForm):
         return text
 
 
+def read_quiz_data(data, correct_choice_format='choice{}'):
+    """
+    Read the questions of a quiz form from posted `data`.
 
-
+    Return a list of (question text, [(choice text, choice value), ...]) in
+    question order, or None if any question or choice text is empty.
+    The correct choice of question i is posted as `{i}_choice_value`
+    formatted with `correct_choice_format`.
+    """
+    questions = []
+    for i in range(1, QUESTIONS_PER_QUIZ + 1):
+        question_text = data.get(f'question_text_{i}', '')
+        correct_choice = data.get(f'{i}_choice_value')
+        choices = []
+        for j in range(1, CHOICES_PER_QUESTION + 1):
+            choice_text = data.get(f'{i}_choice_text_{j}', '')
+            if len(choice_text) == 0:
+                return None
+            if correct_choice == correct_choice_format.format(j):
+                choices.append((choice_text, CHOICE_VALUE['correct']))
+            else:
+                choices.append((choice_text, CHOICE_VALUE['wrong']))
+        if len(question_text) == 0:
+            return None
+        questions.append((question_text, choices))
+    return questions
@@ -0,0 +1,93 @@
+"""
+Optional store for games in progress.
+
+When the GAME_STATE_CACHE setting names a Django cache alias, the state of
+a game in progress is kept in that cache and the Player row is only written
+when the game starts and when it ends (achieved, failed, timeout or quit).
+Without the setting every answer is written to the database.
+
+The cache must be shared by every worker process (memcached, redis, or a
+file based cache on one host): the answers of a game reach any worker, and a
+worker that doesn't see the state falls back to the stale Player row. A
+local memory cache is rejected with ImproperlyConfigured.
+
+A game whose state expired from the cache (GAME_STATE_TIMEOUT seconds
+after its last answer, default 3600) continues from its last saved rows.
+"""
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.exceptions import ImproperlyConfigured
+
+from .models import Player
+
+DEFAULT_TIMEOUT = 3600          # seconds
+
+PLAYER_FIELDS = ['quiz_id', 'current_question_id', 'name', 'time', 'selected_difficulty', 'position',
+                 'is_playing', 'is_failed', 'is_achieved', 'is_timeout', 'correct_answer',
+                 'wrong_answer', 'has_vote', 'start_point', 'end_point', 'start_monotonic', 'clock_id',
+                 'time_limit', 'expires_at']
+
+
+def _cache():
+    alias = getattr(settings, 'GAME_STATE_CACHE', None)
+    if not alias:
+        return None
+    cache = caches[alias]
+    if isinstance(cache, LocMemCache):
+        raise ImproperlyConfigured(f'GAME_STATE_CACHE {alias!r} is a local memory cache, '
+                                   f'which other worker processes don\'t share')
+    return cache
+
+
+def _cache_key(player_id) -> str:
+    return f'quizer_game:game_state:{player_id}'
+
+
+def enabled() -> bool:
+    return _cache() is not None
+
+
+def save(player) -> None:
+    """Keep the state of the game of `player` in the cache"""
+    state = {field: getattr(player, field) for field in PLAYER_FIELDS}
+    timeout = getattr(settings, 'GAME_STATE_TIMEOUT', DEFAULT_TIMEOUT)
+    _cache().set(_cache_key(player.id), state, timeout)
+
+
+def load(quiz_id, player_id):
+    """
+    Return the player of a game in progress kept in the cache, or None if
+    the game is not in the cache
+    """
+    cache = _cache()
+    if cache is None:
+        return None
+    state = cache.get(_cache_key(player_id))
+    if state is None or state['quiz_id'] != quiz_id:
+        return None
+    player = Player(id=player_id, **state)
+    player._state.adding = False
+    return player
+
+
+def expires_at(player_ids) -> dict:
+    """Return the expiry of the games of `player_ids` kept in the cache by player id"""
+    cache = _cache()
+    if cache is None:
+        return {}
+    states = cache.get_many([_cache_key(player_id) for player_id in player_ids])
+    return {player_id: states[_cache_key(player_id)]['expires_at']
+            for player_id in player_ids if _cache_key(player_id) in states}
+
+
+def delete(player_id) -> None:
+    cache = _cache()
+    if cache is not None:
+        cache.delete(_cache_key(player_id))
+
+
+def delete_many(player_ids) -> None:
+    cache = _cache()
+    if cache is not None:
+        cache.delete_many([_cache_key(player_id) for player_id in player_ids])
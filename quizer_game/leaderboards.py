@@ -0,0 +1,241 @@
+"""
+In-process leaderboards of achieved players keyed by (quiz_id, difficulty).
+
+A leaderboard is loaded from the database the first time it is needed and
+then kept up to date by the Player save signal below, so a page view never
+sorts the finishers again. Players are ordered by (time, id); finding the
+rank of a player is a binary search.
+
+Deleted players are removed by the views that delete them (`discard`) or
+when the board is reloaded; a delete signal would turn off Django's fast
+delete of the players of a deleted quiz.
+
+Boards are shared by every client of a process, so they are always loaded
+from the primary database, even in views that read from a replica: a
+lagging replica would otherwise hide finishers from everyone until the
+next reload.
+
+Other worker processes only see each other's finishers after the board is
+reloaded, which happens every LEADERBOARD_REFRESH_SECONDS (default 60). A
+board is reloaded outside of any lock while the stale board keeps serving
+pages; players recorded meanwhile are applied to the new board before it
+replaces the old one.
+
+At most LEADERBOARD_CACHE_SIZE (default 256) boards are kept, the least
+recently read board is dropped first. Boards share a fixed set of locks,
+so the locks don't grow with the number of quizzes either.
+"""
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict, namedtuple
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from .models import Player, DIFFICULTY_NUM
+
+DEFAULT_REFRESH_SECONDS = 60
+DEFAULT_CACHE_SIZE = 256
+LOCK_STRIPES = 64
+
+ENTRY_FIELDS = ['id', 'name', 'time', 'correct_answer', 'wrong_answer']
+
+
+class Entry(namedtuple('Entry', ENTRY_FIELDS)):
+    """Fields of a player that a leaderboard shows, so the board doesn't keep whole game states"""
+    __slots__ = ()
+
+    def __str__(self):
+        return self.name
+
+    @property
+    def total_answer(self) -> int:
+        return self.correct_answer + self.wrong_answer
+
+
+def _entry(player) -> Entry:
+    return Entry(*(getattr(player, field) for field in ENTRY_FIELDS))
+
+
+def _key(player) -> tuple:
+    return player.time, player.id
+
+
+def encode_cursor(player) -> str:
+    """Return the cursor of the page that starts after `player`"""
+    time_spent, player_id = _key(player)
+    return f"{time_spent // timedelta(microseconds=1)}-{player_id}"
+
+
+def decode_cursor(cursor) -> tuple:
+    """Turn a cursor back into a (time, id) key, raise ValueError if it is malformed"""
+    microseconds, player_id = cursor.split('-')
+    return timedelta(microseconds=int(microseconds)), int(player_id)
+
+
+class Leaderboard:
+    """Achieved players of one quiz and difficulty sorted by (time, id)"""
+
+    def __init__(self, entries=()):
+        """Build a board from `entries` already sorted by (time, id)"""
+        self._players = list(entries)
+        self._keys = [_key(entry) for entry in self._players]
+        self._key_of = {entry.id: key for entry, key in zip(self._players, self._keys)}
+        self.loaded_at = time.monotonic()
+
+    def __len__(self):
+        return len(self._players)
+
+    def add(self, player) -> None:
+        self.discard(player.id)
+        key = _key(player)
+        index = bisect_left(self._keys, key)
+        self._keys.insert(index, key)
+        self._players.insert(index, _entry(player))
+        self._key_of[player.id] = key
+
+    def discard(self, player_id) -> None:
+        key = self._key_of.pop(player_id, None)
+        if key is None:
+            return
+        index = bisect_left(self._keys, key)
+        del self._keys[index]
+        del self._players[index]
+
+    def top(self, n=None) -> list:
+        """Return the first `n` players (all players when `n` is None)"""
+        return self._players[:n]
+
+    def page(self, after=None, size=None) -> tuple:
+        """
+        Return (rank of the first player, players) of the page that starts
+        after the (time, id) key `after`
+        """
+        start = 0 if after is None else bisect_right(self._keys, after)
+        end = None if size is None else start + size
+        return start + 1, self._players[start:end]
+
+    def rank(self, player_id):
+        """Return the 1-based rank of a player or None if the player is not on the board"""
+        key = self._key_of.get(player_id)
+        if key is None:
+            return None
+        return bisect_left(self._keys, key) + 1
+
+    def is_stale(self) -> bool:
+        refresh_seconds = getattr(settings, 'LEADERBOARD_REFRESH_SECONDS', DEFAULT_REFRESH_SECONDS)
+        return time.monotonic() - self.loaded_at >= refresh_seconds
+
+
+# least recently read board first
+_boards = OrderedDict()
+_boards_lock = threading.Lock()
+# changes recorded while a board is reloaded, by board key
+_pending = {}
+_locks = [threading.Lock() for _ in range(LOCK_STRIPES)]
+
+
+def _lock(key) -> threading.Lock:
+    return _locks[hash(key) % LOCK_STRIPES]
+
+
+def _use(key, board=None) -> None:
+    """Mark the board of a key as recently read, storing `board` if given, and drop the oldest boards"""
+    with _boards_lock:
+        if board is not None:
+            _boards[key] = board
+        elif key not in _boards:
+            return
+        _boards.move_to_end(key)
+        while len(_boards) > getattr(settings, 'LEADERBOARD_CACHE_SIZE', DEFAULT_CACHE_SIZE):
+            _boards.popitem(last=False)
+
+
+def load(quiz_id, difficulty) -> Leaderboard:
+    players = Player.objects.using(DEFAULT_DB_ALIAS).filter(quiz_id=quiz_id, selected_difficulty=difficulty,
+                                                            is_achieved=True)
+    rows = players.order_by('time', 'id').values_list(*ENTRY_FIELDS)
+    return Leaderboard(Entry(*row) for row in rows.iterator())
+
+
+def get(quiz_id, difficulty) -> Leaderboard:
+    """
+    Return the leaderboard of a quiz and difficulty, loading it if needed; a
+    stale board is returned while another thread reloads it
+    """
+    key = (quiz_id, difficulty)
+    lock = _lock(key)
+    with lock:
+        board = _boards.get(key)
+        reloading = key in _pending
+        if board is not None and (reloading or not board.is_stale()):
+            _use(key)
+            return board
+        if not reloading:
+            _pending[key] = []
+
+    try:
+        new_board = load(quiz_id, difficulty)
+    except BaseException:
+        if not reloading:
+            with lock:
+                _pending.pop(key, None)
+        raise
+    if reloading:
+        # another thread loads the first board of this key, use this copy once
+        return new_board
+
+    with lock:
+        for change in _pending.pop(key, ()):
+            change(new_board)
+        _use(key, new_board)
+    return new_board
+
+
+def loaded(quiz_id, difficulty):
+    """Return the loaded leaderboard of a quiz and difficulty, or None, without loading it"""
+    return _boards.get((quiz_id, difficulty))
+
+
+def _change(quiz_id, difficulty, change) -> None:
+    """Apply `change` to the loaded board of a key and to the board being reloaded"""
+    key = (quiz_id, difficulty)
+    with _lock(key):
+        board = _boards.get(key)
+        if board is not None:
+            change(board)
+        if key in _pending:
+            _pending[key].append(change)
+
+
+def record(player) -> None:
+    """Add or remove a player from the loaded leaderboards of its quiz"""
+    entry = _entry(player)
+    for difficulty in DIFFICULTY_NUM:
+        if player.is_achieved and player.selected_difficulty == difficulty:
+            _change(player.quiz_id, difficulty, lambda board: board.add(entry))
+        else:
+            _change(player.quiz_id, difficulty, lambda board: board.discard(entry.id))
+
+
+def discard(player) -> None:
+    player_id = player.id
+    for difficulty in DIFFICULTY_NUM:
+        _change(player.quiz_id, difficulty, lambda board: board.discard(player_id))
+
+
+def clear() -> None:
+    """Forget every loaded leaderboard"""
+    with _boards_lock:
+        _boards.clear()
+        _pending.clear()
+
+
+@receiver(post_save, sender=Player)
+def player_saved_callback(sender, instance, **kwargs):
+    """Keep loaded leaderboards in sync when a player is saved"""
+    record(instance)
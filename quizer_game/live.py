@@ -0,0 +1,161 @@
+"""
+Live leaderboard updates.
+
+When a player reaches the finish line, `publish_finisher` computes the
+player's rank once and publishes a delta to every spectator of the
+(quiz_id, difficulty) leaderboard through a broker. The default broker
+keeps subscribers in process, so spectators only see finishers of games
+played by the same worker process; the LIVE_BROKER setting can name
+another broker class with the same publish/subscribe/unsubscribe methods.
+
+Each open stream holds a worker thread, so a process serves at most
+LIVE_MAX_STREAMS streams at a time (keep it well below the number of
+threads); `open_stream` returns None beyond that and the view answers 503.
+"""
+import json
+import queue
+import threading
+import time
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from . import leaderboards
+from .templatetags.quizer_game_extras import duration
+
+QUEUE_SIZE = 100
+DEFAULT_KEEPALIVE_SECONDS = 15
+DEFAULT_STREAM_SECONDS = 300
+DEFAULT_MAX_STREAMS = 4
+
+
+class LocalBroker:
+    """In-process publish/subscribe of events by channel"""
+
+    def __init__(self):
+        self._subscribers = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, channel) -> queue.Queue:
+        events = queue.Queue(maxsize=QUEUE_SIZE)
+        with self._lock:
+            self._subscribers.setdefault(channel, set()).add(events)
+        return events
+
+    def unsubscribe(self, channel, events) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(channel, set())
+            subscribers.discard(events)
+            if not subscribers:
+                self._subscribers.pop(channel, None)
+
+    def publish(self, channel, event) -> int:
+        """Send an event to the subscribers of a channel, return the number of subscribers"""
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+        for events in subscribers:
+            try:
+                events.put_nowait(event)
+            except queue.Full:
+                # a spectator that doesn't keep up misses events, the page still works
+                pass
+        return len(subscribers)
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def broker():
+    global _broker
+    with _broker_lock:
+        if _broker is None:
+            _broker = import_string(getattr(settings, 'LIVE_BROKER', 'quizer_game.live.LocalBroker'))()
+        return _broker
+
+
+def channel(quiz_id, difficulty) -> str:
+    return f'leaderboard:{quiz_id}:{difficulty}'
+
+
+def publish_finisher(player) -> None:
+    """
+    Publish the rank of a player who reached the finish line, read from the
+    leaderboard loaded by spectators of this process (the rank is None when
+    no board is loaded, the answering request never loads one)
+    """
+    board = leaderboards.loaded(player.quiz_id, player.selected_difficulty)
+    event = {'id': player.id,
+             'rank': board.rank(player.id) if board is not None else None,
+             'name': player.name,
+             'time': duration(player.time),
+             'total_answer': player.total_answer,
+             }
+    broker().publish(channel(player.quiz_id, player.selected_difficulty), event)
+
+
+class EventStream:
+    """Events of a stream that give its slot back when the response is closed"""
+
+    def __init__(self, events):
+        self._events = events
+        self._closed = False
+
+    def __iter__(self):
+        return self._events
+
+    def close(self) -> None:
+        if not self._closed:
+            self._closed = True
+            self._events.close()
+            _release_stream()
+
+
+_open_streams = 0
+_streams_lock = threading.Lock()
+
+
+def _release_stream() -> None:
+    global _open_streams
+    with _streams_lock:
+        _open_streams -= 1
+
+
+def open_stream(quiz_id, difficulty):
+    """
+    Return the EventStream of a leaderboard, or None if LIVE_MAX_STREAMS
+    streams are already open in this process
+    """
+    global _open_streams
+    with _streams_lock:
+        if _open_streams >= getattr(settings, 'LIVE_MAX_STREAMS', DEFAULT_MAX_STREAMS):
+            return None
+        _open_streams += 1
+    return EventStream(stream(quiz_id, difficulty))
+
+
+def stream(quiz_id, difficulty):
+    """
+    Yield the Server-Sent Events of a leaderboard until LIVE_STREAM_SECONDS
+    have passed, with a comment every LIVE_KEEPALIVE_SECONDS to keep the
+    connection open
+    """
+    keepalive = getattr(settings, 'LIVE_KEEPALIVE_SECONDS', DEFAULT_KEEPALIVE_SECONDS)
+    deadline = time.monotonic() + getattr(settings, 'LIVE_STREAM_SECONDS', DEFAULT_STREAM_SECONDS)
+    name = channel(quiz_id, difficulty)
+    events = broker().subscribe(name)
+    try:
+        yield f'retry: {keepalive * 1000}\n\n'
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            try:
+                event = events.get(timeout=min(keepalive, remaining))
+            except queue.Empty:
+                if time.monotonic() < deadline:
+                    yield ': keepalive\n\n'
+                continue
+            yield f'event: finisher\ndata: {json.dumps(event)}\n\n'
+    finally:
+        broker().unsubscribe(name, events)
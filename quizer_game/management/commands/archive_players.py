@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from quizer_game import archive
+
+
+class Command(BaseCommand):
+    help = 'Move old failed and timed out players to the archive and purge expired archived players'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=None,
+                            help='Archive players who finished more than DAYS days ago')
+        parser.add_argument('--retention-days', type=int, default=None,
+                            help='Purge archived players older than RETENTION_DAYS days, 0 keeps them')
+        parser.add_argument('--batch-size', type=int, default=archive.BATCH_SIZE,
+                            help='Number of players moved per transaction')
+
+    def handle(self, *args, **options):
+        archived = archive.archive_players(days=options['days'], batch_size=options['batch_size'])
+        purged = archive.purge_archive(days=options['retention_days'])
+        self.stdout.write(f'Archived {archived} players, purged {purged} archived players')
@@ -0,0 +1,70 @@
+import random
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from quizer_game.models import Quiz, Question, Player
+
+
+class Rollback(Exception):
+    """Raised to throw away the benchmark data"""
+
+
+class Command(BaseCommand):
+    help = 'Measure leaderboard and next-question latency against a large players table'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--players', type=int, default=1000000,
+                            help='number of players to create (default: 1000000)')
+        parser.add_argument('--quizzes', type=int, default=100,
+                            help='number of quizzes the players are spread over (default: 100)')
+        parser.add_argument('--repeat', type=int, default=50,
+                            help='number of times each query is run (default: 50)')
+
+    def handle(self, *args, **options):
+        # everything runs inside a transaction that is rolled back at the end
+        try:
+            with transaction.atomic():
+                self.run(options['players'], options['quizzes'], options['repeat'])
+                raise Rollback
+        except Rollback:
+            pass
+
+    def run(self, total_players, total_quizzes, repeat):
+        self.stdout.write(f'Creating {total_quizzes} quizzes and {total_players} players...')
+        Quiz.objects.bulk_create(Quiz(topic=f'Benchmark {i}') for i in range(total_quizzes))
+        quizzes = list(Quiz.objects.filter(topic__startswith='Benchmark ').order_by('id'))
+        Question.objects.bulk_create(Question(quiz=quiz, text=f'Question {number}', number=number)
+                                     for quiz in quizzes for number in range(1, 21))
+
+        batch = []
+        for i in range(total_players):
+            batch.append(Player(quiz=random.choice(quizzes), name=f'player{i}',
+                                selected_difficulty=random.randint(0, 2),
+                                is_achieved=random.random() < 0.3,
+                                time=timedelta(seconds=random.randint(10, 600))))
+            if len(batch) == 10000:
+                Player.objects.bulk_create(batch)
+                batch = []
+        Player.objects.bulk_create(batch)
+
+        quiz = quizzes[0]
+        self.measure('leaderboard', repeat,
+                     lambda: list(quiz.player_set.filter(selected_difficulty=0, is_achieved=True)
+                                  .order_by('time')[:50]))
+        self.measure('total_player', repeat, lambda: quiz.total_player)
+        self.measure('next question', repeat,
+                     lambda: quiz.question_set.get(number=random.randint(1, 20)))
+
+    def measure(self, name, repeat, query):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            query()
+            timings.append(time.perf_counter() - start)
+        timings.sort()
+        median = timings[len(timings) // 2] * 1000
+        worst = timings[-1] * 1000
+        self.stdout.write(f'{name:<15} median {median:8.2f} ms   max {worst:8.2f} ms')
@@ -0,0 +1,23 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from quizer_game import expiry
+
+
+class Command(BaseCommand):
+    help = 'Time out hard games past their time limit and fail easy and medium games left idle'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=expiry.BATCH_SIZE,
+                            help='Number of games updated per transaction')
+        parser.add_argument('--interval', type=int, default=0,
+                            help='Run again every INTERVAL seconds instead of once')
+
+    def handle(self, *args, **options):
+        while True:
+            result = expiry.expire_games(batch_size=options['batch_size'])
+            self.stdout.write(f"Expired {result['timeout']} timed out and {result['failed']} failed games")
+            if not options['interval']:
+                return
+            time.sleep(options['interval'])
@@ -0,0 +1,73 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.error import URLError
+from urllib.request import urlopen
+
+from django.core.management.base import BaseCommand
+
+DEFAULT_PATHS = ['/', '/leaderboard-index/', '/quiz-index/']
+
+
+class Command(BaseCommand):
+    help = 'Send concurrent GET requests to a running server and report throughput and latency'
+
+    def add_arguments(self, parser):
+        parser.add_argument('base_url', help='server to test, e.g. http://127.0.0.1:8000')
+        parser.add_argument('--path', action='append', dest='paths',
+                            help='path to request, can be repeated (default: index pages)')
+        parser.add_argument('--requests', type=int, default=1000,
+                            help='number of requests per path (default: 1000)')
+        parser.add_argument('--concurrency', type=int, default=50,
+                            help='number of requests in flight (default: 50)')
+        parser.add_argument('--streams', type=int, default=0,
+                            help='live leaderboard streams to hold open during the test (default: 0)')
+        parser.add_argument('--stream-path', default='/leaderboard/1/0/live/',
+                            help='path of the live leaderboard stream')
+
+    def handle(self, *args, **options):
+        base_url = options['base_url'].rstrip('/')
+        stop = threading.Event()
+        streams = [threading.Thread(target=self.hold_stream, args=(base_url + options['stream_path'], stop),
+                                    daemon=True)
+                   for _ in range(options['streams'])]
+        for stream in streams:
+            stream.start()
+        try:
+            for path in options['paths'] or DEFAULT_PATHS:
+                self.measure(base_url + path, options['requests'], options['concurrency'])
+        finally:
+            stop.set()
+
+    def hold_stream(self, url, stop):
+        try:
+            with urlopen(url, timeout=60) as response:
+                while not stop.is_set() and response.readline():
+                    pass
+        except (URLError, OSError):
+            pass
+
+    def fetch(self, url):
+        start = time.perf_counter()
+        try:
+            with urlopen(url, timeout=30) as response:
+                response.read()
+                ok = response.status == 200
+        except (URLError, OSError):
+            ok = False
+        return ok, time.perf_counter() - start
+
+    def measure(self, url, total, concurrency):
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            results = list(executor.map(self.fetch, [url] * total))
+        elapsed = time.perf_counter() - start
+
+        timings = sorted(timing for ok, timing in results if ok)
+        errors = total - len(timings)
+        if not timings:
+            self.stdout.write(f'{url}: all {total} requests failed')
+            return
+        p50, p95, p99 = (timings[min(len(timings) - 1, int(len(timings) * q))] * 1000 for q in (0.5, 0.95, 0.99))
+        self.stdout.write(f'{url}: {len(timings) / elapsed:8.1f} req/s   p50 {p50:7.1f} ms   '
+                          f'p95 {p95:7.1f} ms   p99 {p99:7.1f} ms   errors {errors}')
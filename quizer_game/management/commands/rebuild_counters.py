@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from quizer_game import counters
+
+
+class Command(BaseCommand):
+    help = 'Recount the stored counters of every quiz from the players table'
+
+    def handle(self, *args, **options):
+        total = counters.rebuild()
+        self.stdout.write(f'Rebuilt counters of {total} quizzes')
@@ -0,0 +1,166 @@
+"""
+Request metrics per URL name.
+
+`RequestMetricsMiddleware` measures every request: the number of queries
+and the time spent in them (on every database alias), the time spent
+rendering templates (through the TimedDjangoTemplates template backend) and
+the total time. The measures are added to in-process histograms keyed by
+the URL name (e.g. "quizer_game:leaderboard") and shown to staff users by
+the `request_metrics` view. With the SERVER_TIMING setting the measures of
+each request are also sent in a Server-Timing header.
+
+Each worker process keeps its own histograms.
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+from django.template.backends.django import DjangoTemplates, Template
+
+# upper bounds of the histogram buckets, the last bucket has no bound
+LATENCY_BUCKETS = [5, 10, 25, 50, 100, 250, 500, 1000, 2500]     # milliseconds
+QUERY_BUCKETS = [0, 1, 2, 5, 10, 20, 50]
+
+
+class Histogram:
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.total = 0
+        self.max = 0
+
+    def add(self, value) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def as_dict(self) -> dict:
+        labels = [f'<={bound}' for bound in self.bounds] + [f'>{self.bounds[-1]}']
+        requests = sum(self.counts)
+        return {'buckets': dict(zip(labels, self.counts)),
+                'mean': round(self.total / requests, 2) if requests else 0,
+                'max': round(self.max, 2),
+                }
+
+
+class ViewMetrics:
+    """Histograms of the requests of one URL name"""
+
+    def __init__(self):
+        self.requests = 0
+        self.queries = Histogram(QUERY_BUCKETS)
+        self.db_time = Histogram(LATENCY_BUCKETS)
+        self.template_time = Histogram(LATENCY_BUCKETS)
+        self.total_time = Histogram(LATENCY_BUCKETS)
+
+    def add(self, measure) -> None:
+        self.requests += 1
+        self.queries.add(measure.queries)
+        self.db_time.add(measure.db_time)
+        self.template_time.add(measure.template_time)
+        self.total_time.add(measure.total_time)
+
+    def as_dict(self) -> dict:
+        return {'requests': self.requests,
+                'queries': self.queries.as_dict(),
+                'db_ms': self.db_time.as_dict(),
+                'template_ms': self.template_time.as_dict(),
+                'total_ms': self.total_time.as_dict(),
+                }
+
+
+class Measure:
+    """Measures of one request, times in milliseconds"""
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.template_time = 0.0
+        self.total_time = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        """Database execute wrapper counting the queries and their time"""
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.db_time += (time.perf_counter() - start) * 1000
+
+    def server_timing(self) -> str:
+        return (f'db;dur={self.db_time:.1f};desc="{self.queries} queries", '
+                f'tpl;dur={self.template_time:.1f}, total;dur={self.total_time:.1f}')
+
+
+_views = {}
+_lock = threading.Lock()
+_current = threading.local()
+
+
+def record(url_name, measure) -> None:
+    with _lock:
+        _views.setdefault(url_name, ViewMetrics()).add(measure)
+
+
+def snapshot() -> dict:
+    """Return the metrics of every URL name"""
+    with _lock:
+        return {url_name: metrics.as_dict() for url_name, metrics in sorted(_views.items())}
+
+
+def clear() -> None:
+    with _lock:
+        _views.clear()
+
+
+class RequestMetricsMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not getattr(settings, 'REQUEST_METRICS', True):
+            return self.get_response(request)
+
+        measure = Measure()
+        _current.measure = measure
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(measure))
+                response = self.get_response(request)
+        finally:
+            _current.measure = None
+        measure.total_time = (time.perf_counter() - start) * 1000
+
+        match = getattr(request, 'resolver_match', None)
+        record(match.view_name if match else '<unresolved>', measure)
+        if getattr(settings, 'SERVER_TIMING', False):
+            response['Server-Timing'] = measure.server_timing()
+        return response
+
+
+class TimedTemplate(Template):
+    def render(self, context=None, request=None):
+        measure = getattr(_current, 'measure', None)
+        if measure is None:
+            return super().render(context, request)
+        start = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            measure.template_time += (time.perf_counter() - start) * 1000
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """Django template backend whose templates add their render time to the request metrics"""
+
+    def from_string(self, template_code):
+        return TimedTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        template = super().get_template(template_name)
+        return TimedTemplate(template.template, self)
@@ -0,0 +1,29 @@
+# Generated by Django 2.2.6 on 2026-10-18 20:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quizer_game', '0003_add_user_id_intfield'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='player',
+            index=models.Index(condition=models.Q(is_achieved=True), fields=['quiz', 'selected_difficulty', 'time'], name='player_leaderboard_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='player',
+            index=models.Index(fields=['quiz', 'is_achieved'], name='player_quiz_achieved_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='quiz',
+            index=models.Index(fields=['user_id'], name='quiz_user_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='question',
+            constraint=models.UniqueConstraint(fields=('quiz', 'number'), name='unique_question_number'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 2.2.6 on 2026-10-18 20:26
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_finishers(apps, schema_editor):
+    Quiz = apps.get_model('quizer_game', 'Quiz')
+    Player = apps.get_model('quizer_game', 'Player')
+    finishers = Player.objects.filter(quiz=OuterRef('pk'), is_achieved=True)
+    finishers = finishers.order_by().values('quiz').annotate(total=Count('pk')).values('total')
+    Quiz.objects.update(finisher_count=Coalesce(Subquery(finishers), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quizer_game', '0004_add_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quiz',
+            name='finisher_count',
+            field=models.IntegerField(default=0, verbose_name='Number of achieved players'),
+        ),
+        migrations.RunPython(count_finishers, migrations.RunPython.noop),
+    ]
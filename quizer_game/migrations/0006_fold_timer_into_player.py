@@ -0,0 +1,62 @@
+# Generated by Django 2.2.6 on 2026-10-18 20:33
+
+import datetime
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+BATCH_SIZE = 1000
+
+
+def copy_timers_to_players(apps, schema_editor):
+    Player = apps.get_model('quizer_game', 'Player')
+    Timer = apps.get_model('quizer_game', 'Timer')
+    timers = Timer.objects.filter(player=OuterRef('pk')).order_by('id')
+    zero = Value(datetime.timedelta(0), output_field=models.DurationField())
+    Player.objects.update(**{field: Coalesce(Subquery(timers.values(field)[:1]), zero)
+                             for field in ['start_point', 'end_point', 'time_limit']})
+
+
+def copy_players_to_timers(apps, schema_editor):
+    Player = apps.get_model('quizer_game', 'Player')
+    Timer = apps.get_model('quizer_game', 'Timer')
+    players = Player.objects.values_list('id', 'start_point', 'end_point', 'time_limit').order_by('id')
+    last_id = 0
+    while True:
+        # bulk_create makes a list of its objects, so insert the timers in batches
+        batch = list(players.filter(id__gt=last_id)[:BATCH_SIZE])
+        if not batch:
+            return
+        Timer.objects.bulk_create(Timer(player_id=player_id, start_point=start_point,
+                                        end_point=end_point, time_limit=time_limit)
+                                  for player_id, start_point, end_point, time_limit in batch)
+        last_id = batch[-1][0]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quizer_game', '0005_quiz_finisher_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='player',
+            name='end_point',
+            field=models.DurationField(blank=True, default=datetime.timedelta(0), verbose_name='Stop point'),
+        ),
+        migrations.AddField(
+            model_name='player',
+            name='start_point',
+            field=models.DurationField(default=datetime.timedelta(0), verbose_name='Start point'),
+        ),
+        migrations.AddField(
+            model_name='player',
+            name='time_limit',
+            field=models.DurationField(blank=True, default=datetime.timedelta(0), verbose_name='Time limit'),
+        ),
+        migrations.RunPython(copy_timers_to_players, copy_players_to_timers),
+        migrations.DeleteModel(
+            name='Timer',
+        ),
+    ]
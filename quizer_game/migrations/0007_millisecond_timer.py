@@ -0,0 +1,85 @@
+# Generated by Django 2.2.6 on 2026-10-18 20:41
+
+import datetime
+from django.db import migrations, models
+
+MILLISECOND = datetime.timedelta(milliseconds=1)
+BATCH_SIZE = 1000
+
+
+def batches(queryset):
+    """Yield the rows of `queryset` in lists of BATCH_SIZE, so a large table is never held in memory"""
+    last_pk = 0
+    while True:
+        batch = list(queryset.filter(pk__gt=last_pk).order_by('pk')[:BATCH_SIZE])
+        if not batch:
+            return
+        yield batch
+        last_pk = batch[-1].pk
+
+
+def durations_to_milliseconds(apps, schema_editor):
+    Player = apps.get_model('quizer_game', 'Player')
+    for players in batches(Player.objects.only('start_point', 'end_point')):
+        for player in players:
+            player.start_point_ms = player.start_point // MILLISECOND
+            player.end_point_ms = player.end_point // MILLISECOND
+        Player.objects.bulk_update(players, ['start_point_ms', 'end_point_ms'])
+
+
+def milliseconds_to_durations(apps, schema_editor):
+    Player = apps.get_model('quizer_game', 'Player')
+    for players in batches(Player.objects.only('start_point_ms', 'end_point_ms')):
+        for player in players:
+            player.start_point = player.start_point_ms * MILLISECOND
+            player.end_point = player.end_point_ms * MILLISECOND
+        Player.objects.bulk_update(players, ['start_point', 'end_point'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quizer_game', '0006_fold_timer_into_player'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='player',
+            name='start_point_ms',
+            field=models.BigIntegerField(default=0, verbose_name='Start point'),
+        ),
+        migrations.AddField(
+            model_name='player',
+            name='end_point_ms',
+            field=models.BigIntegerField(blank=True, default=0, verbose_name='Stop point'),
+        ),
+        migrations.RunPython(durations_to_milliseconds, milliseconds_to_durations),
+        migrations.RemoveField(
+            model_name='player',
+            name='start_point',
+        ),
+        migrations.RemoveField(
+            model_name='player',
+            name='end_point',
+        ),
+        migrations.RenameField(
+            model_name='player',
+            old_name='start_point_ms',
+            new_name='start_point',
+        ),
+        migrations.RenameField(
+            model_name='player',
+            old_name='end_point_ms',
+            new_name='end_point',
+        ),
+        migrations.AddField(
+            model_name='player',
+            name='start_monotonic',
+            field=models.BigIntegerField(blank=True, null=True, verbose_name='Monotonic start point'),
+        ),
+        migrations.AddField(
+            model_name='player',
+            name='clock_id',
+            field=models.CharField(blank=True, max_length=64, verbose_name='Clock'),
+        ),
+    ]
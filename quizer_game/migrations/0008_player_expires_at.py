@@ -0,0 +1,53 @@
+# Generated by Django 2.2.6 on 2026-10-18 20:36
+
+import datetime
+from django.db import migrations, models
+
+MILLISECOND = datetime.timedelta(milliseconds=1)
+HARD = 2
+IDLE_TIMEOUT = 1800 * 1000      # milliseconds
+BATCH_SIZE = 1000
+
+
+def batches(queryset):
+    """Yield the rows of `queryset` in lists of BATCH_SIZE, so a large table is never held in memory"""
+    last_pk = 0
+    while True:
+        batch = list(queryset.filter(pk__gt=last_pk).order_by('pk')[:BATCH_SIZE])
+        if not batch:
+            return
+        yield batch
+        last_pk = batch[-1].pk
+
+
+def set_expiry_of_games_in_progress(apps, schema_editor):
+    Player = apps.get_model('quizer_game', 'Player')
+    games = Player.objects.filter(is_playing=True).only('selected_difficulty', 'start_point', 'end_point',
+                                                        'time_limit')
+    for players in batches(games):
+        for player in players:
+            if player.selected_difficulty == HARD:
+                player.expires_at = player.start_point + player.time_limit // MILLISECOND
+            else:
+                player.expires_at = player.end_point + IDLE_TIMEOUT
+        Player.objects.bulk_update(players, ['expires_at'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quizer_game', '0007_millisecond_timer'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='player',
+            name='expires_at',
+            field=models.BigIntegerField(blank=True, null=True, verbose_name='Expires at'),
+        ),
+        migrations.RunPython(set_expiry_of_games_in_progress, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='player',
+            index=models.Index(condition=models.Q(is_playing=True), fields=['expires_at'], name='player_expires_idx'),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 2.2.6 on 2026-10-18 20:38
+
+import datetime
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quizer_game', '0008_player_expires_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedPlayer',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=200, verbose_name='Name')),
+                ('selected_difficulty', models.SmallIntegerField(default=0, verbose_name='Difficulty')),
+                ('outcome', models.SmallIntegerField(choices=[(0, 'Failed'), (1, 'Timeout')], default=0, verbose_name='Outcome')),
+                ('correct_answer', models.SmallIntegerField(default=0, verbose_name='Number of correct answers')),
+                ('wrong_answer', models.SmallIntegerField(default=0, verbose_name='Number of wrong answers')),
+                ('time', models.DurationField(default=datetime.timedelta(0), verbose_name='Time spent')),
+                ('end_point', models.BigIntegerField(default=0, verbose_name='Stop point')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='player',
+            index=models.Index(condition=models.Q(('is_achieved', False), ('is_playing', False)), fields=['end_point'], name='player_archive_idx'),
+        ),
+        migrations.AddField(
+            model_name='archivedplayer',
+            name='quiz',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, to='quizer_game.Quiz', verbose_name='Quiz'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedplayer',
+            index=models.Index(fields=['end_point'], name='archived_player_end_idx'),
+        ),
+    ]
@@ -1,9 +1,18 @@
+from django.conf import settings
 from django.db import models
-import time
 from datetime import timedelta
 
+from . import clock
+
 # Create your models here.
+DIFFICULTY = {'easy': 0, 'medium': 1, 'hard': 2}
 DIFFICULTY_NUM = {0: 'Easy', 1: 'Medium', 2: 'Hard'}
+CHOICE_VALUE = {'wrong': 0, 'correct': 1}
+POSITION = {'max': 15, 'min': 0}
+HARD_LVL_TIME_LIMIT = 60            # seconds
+GAME_IDLE_TIMEOUT = 1800            # seconds, default for settings.GAME_IDLE_TIMEOUT
+# players of the fixture that are reset for each game instead of being created
+PLAYERS_FOR_TESTING = ['player_test_5_q', 'player_test_20_q']
 
 
 class Quiz(models.Model):
@@ -11,11 +20,18 @@ class Quiz(models.Model):
     upvotes = models.IntegerField(default=0, verbose_name='Upvote')
     downvotes = models.IntegerField(default=0, verbose_name='Downvote')
     user_id = models.IntegerField(blank=True, null=True)
+    finisher_count = models.IntegerField(default=0, verbose_name='Number of achieved players')
+    # changed with the topic, votes and finishers, validator of the quiz pages
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='Updated at')
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user_id'], name='quiz_user_idx'),
+        ]
 
     @property
     def total_player(self) -> int:
-        players = self.player_set.filter(is_achieved=True)
-        return len(players)
+        return self.finisher_count
 
     def __str__(self):
         return self.topic
@@ -26,6 +42,11 @@ class Question(models.Model):
     text = models.CharField(max_length=200)
     number = models.IntegerField(default=0, verbose_name='Number')
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['quiz', 'number'], name='unique_question_number'),
+        ]
+
     def __str__(self):
         return self.text
 
@@ -53,23 +74,86 @@ class Player(models.Model):
     correct_answer = models.IntegerField(default=0, verbose_name='Number of correct answers')
     wrong_answer = models.IntegerField(default=0, verbose_name='Number of wrong answers')
     has_vote = models.BooleanField(default=True)
+    # timer points in milliseconds since the epoch
+    start_point = models.BigIntegerField(default=0, verbose_name='Start point')
+    end_point = models.BigIntegerField(default=0, blank=True, verbose_name='Stop point')
+    # monotonic clock reading at the start point and the clock it was read from
+    start_monotonic = models.BigIntegerField(null=True, blank=True, verbose_name='Monotonic start point')
+    clock_id = models.CharField(max_length=64, blank=True, verbose_name='Clock')
+    time_limit = models.DurationField(default=timedelta(seconds=0), blank=True, verbose_name='Time limit')
+    # milliseconds since the epoch when an unfinished game expires
+    expires_at = models.BigIntegerField(null=True, blank=True, verbose_name='Expires at')
+    # validator of the result page
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='Updated at')
+
+    class Meta:
+        indexes = [
+            # expire_games: games in progress ordered by deadline
+            models.Index(fields=['expires_at'], name='player_expires_idx',
+                         condition=models.Q(is_playing=True)),
+            # leaderboard: achieved players of a quiz and difficulty ordered by time
+            models.Index(fields=['quiz', 'selected_difficulty', 'time'],
+                         name='player_leaderboard_idx',
+                         condition=models.Q(is_achieved=True)),
+            # Quiz.total_player
+            models.Index(fields=['quiz', 'is_achieved'], name='player_quiz_achieved_idx'),
+            # archive_players: finished players who didn't reach the finish line
+            models.Index(fields=['end_point'], name='player_archive_idx',
+                         condition=models.Q(is_playing=False, is_achieved=False)),
+        ]
 
     def __str__(self):
         return self.name
 
     def move_forward(self) -> None:
         self.position += 1
-        self.save()
 
     def move_backward(self) -> None:
         self.position -= 1
-        self.save()
 
     def save_time_duration(self) -> None:
-        timer = Timer.objects.get(player=self)
-        self.time = timer.time_duration
+        self.time = self.time_duration
         self.save()
 
+    def start_timer(self, commit=True) -> None:
+        self.start_point = clock.now_ms()
+        self.start_monotonic = clock.monotonic_ms()
+        self.clock_id = clock.CLOCK_ID
+        if commit:
+            self.save()
+
+    def stop_timer(self, commit=True) -> None:
+        if self.start_monotonic is not None and self.clock_id == clock.CLOCK_ID:
+            # same monotonic clock as the start point, wall clock changes don't matter
+            self.end_point = self.start_point + clock.monotonic_ms() - self.start_monotonic
+        else:
+            self.end_point = clock.now_ms()
+        if commit:
+            self.save()
+
+    @property
+    def time_duration(self):
+        time_duration = timedelta(milliseconds=abs(self.end_point - self.start_point))
+        return time_duration
+
+    def refresh_expiry(self) -> None:
+        """
+        Set when the game expires if the player doesn't answer: at the time
+        limit for hard level, after GAME_IDLE_TIMEOUT for other levels
+        """
+        if not self.is_playing:
+            self.expires_at = None
+        elif self.selected_difficulty == DIFFICULTY['hard']:
+            self.expires_at = self.start_point + self.time_limit // timedelta(milliseconds=1)
+        else:
+            idle_timeout = getattr(settings, 'GAME_IDLE_TIMEOUT', GAME_IDLE_TIMEOUT)
+            self.expires_at = clock.now_ms() + idle_timeout * 1000
+
+    def set_time_limit(self, seconds, minutes=0, hours=0, commit=True) -> None:
+        self.time_limit = timedelta(hours=hours, minutes=minutes, seconds=seconds)
+        if commit:
+            self.save()
+
     @property
     def total_answer(self) -> int:
         return self.correct_answer + self.wrong_answer
@@ -79,30 +163,43 @@ class Player(models.Model):
         return DIFFICULTY_NUM[self.selected_difficulty]
 
 
-class Timer(models.Model):
-    start_point = models.DurationField(default=timedelta(seconds=0), verbose_name='Start point')
-    end_point = models.DurationField(default=timedelta(seconds=0), blank=True, verbose_name='Stop point')
-    time_limit = models.DurationField(default=timedelta(seconds=0), blank=True, verbose_name='Time limit')
-    player = models.ForeignKey(Player, on_delete=models.CASCADE, verbose_name='Player')
+def quiz_tree_prefetch() -> list:
+    """
+    Return lookups for `prefetch_related` that load the questions of a quiz
+    ordered by number together with their choices
+    """
+    return [models.Prefetch('question_set', queryset=Question.objects.order_by('number')),
+            models.Prefetch('question_set__choice_set', queryset=Choice.objects.order_by('id'))]
 
-    def __str__(self):
-        return f"A timer of {self.player}"
 
-    def start(self) -> None:
-        seconds = int(time.time())
-        self.start_point = timedelta(seconds=seconds)
-        self.save()
+class ArchivedPlayer(models.Model):
+    """Compact copy of a finished player who didn't reach the finish line"""
+    FAILED = 0
+    TIMEOUT = 1
+    OUTCOME = ((FAILED, 'Failed'), (TIMEOUT, 'Timeout'))
 
-    def stop(self) -> None:
-        seconds = int(time.time())
-        self.end_point = timedelta(seconds=seconds)
-        self.save()
+    quiz = models.ForeignKey(Quiz, on_delete=models.CASCADE, null=True, verbose_name='Quiz')
+    name = models.CharField(max_length=200, verbose_name='Name')
+    selected_difficulty = models.SmallIntegerField(default=0, verbose_name='Difficulty')
+    outcome = models.SmallIntegerField(choices=OUTCOME, default=FAILED, verbose_name='Outcome')
+    correct_answer = models.SmallIntegerField(default=0, verbose_name='Number of correct answers')
+    wrong_answer = models.SmallIntegerField(default=0, verbose_name='Number of wrong answers')
+    time = models.DurationField(default=timedelta(seconds=0), verbose_name='Time spent')
+    # milliseconds since the epoch
+    end_point = models.BigIntegerField(default=0, verbose_name='Stop point')
+
+    class Meta:
+        indexes = [
+            # archive retention: purge the oldest rows
+            models.Index(fields=['end_point'], name='archived_player_end_idx'),
+        ]
 
-    @property
-    def time_duration(self):
-        time_duration = abs(self.end_point - self.start_point)
-        return time_duration
+    def __str__(self):
+        return self.name
 
-    def set_time_limit(self, seconds, minutes=0, hours=0) -> None:
-        self.time_limit = timedelta(hours=hours, minutes=minutes, seconds=seconds)
-        self.save()
+    @classmethod
+    def from_player(cls, player):
+        return cls(quiz_id=player.quiz_id, name=player.name, selected_difficulty=player.selected_difficulty,
+                   outcome=cls.TIMEOUT if player.is_timeout else cls.FAILED,
+                   correct_answer=player.correct_answer, wrong_answer=player.wrong_answer,
+                   time=player.time, end_point=player.end_point)
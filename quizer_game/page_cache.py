@@ -0,0 +1,122 @@
+"""
+Cache of pages that only change when quizzes change.
+
+Pages decorated with `cached_page` are kept in the cache named by the
+PAGE_CACHE setting (the default cache unless set, an empty value turns
+caching off) for PAGE_CACHE_TIMEOUT seconds, keyed on the URL and on the
+user shown in the nav bar. Every key also holds a version number that
+`invalidate()` increments when a quiz is created, edited, deleted or voted
+on, so all cached pages are dropped at once. With a local memory cache
+other processes see the new version only after their pages expire.
+
+The ETag of a page is a digest of its body kept with the body, so a process
+serving an older copy of a page never answers 304 for a newer one (and the
+other way round).
+
+Pages with a form (CSRF token) or flash messages must not be cached.
+"""
+import functools
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, quote_etag
+
+from .models import Quiz
+
+DEFAULT_TIMEOUT = 300           # seconds
+VERSION_KEY = 'quizer_game:page_cache:version'
+
+
+def _cache():
+    alias = getattr(settings, 'PAGE_CACHE', 'default')
+    return caches[alias] if alias else None
+
+
+def _timeout() -> int:
+    return getattr(settings, 'PAGE_CACHE_TIMEOUT', DEFAULT_TIMEOUT)
+
+
+def _version(cache) -> int:
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        # start from the clock so a lost version doesn't reuse old keys
+        cache.add(VERSION_KEY, int(time.time()), None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def _key(cache, name, *parts) -> str:
+    digest = hashlib.md5(':'.join(str(part) for part in parts).encode()).hexdigest()
+    return f'quizer_game:page_cache:{name}:{_version(cache)}:{digest}'
+
+
+def invalidate() -> None:
+    """Drop every cached page"""
+    cache = _cache()
+    if cache is None:
+        return
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        _version(cache)
+
+
+def body_etag(body) -> str:
+    return quote_etag(hashlib.md5(body).hexdigest())
+
+
+def cached_page(view):
+    """
+    Cache the GET responses of `view` per URL and logged in user, and answer
+    conditional GETs with the ETag of the cached body
+    """
+    @functools.wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if request.method != 'GET':
+            return view(request, *args, **kwargs)
+
+        cache = _cache()
+        key = None
+        if cache is not None:
+            username = request.user.get_username() if request.user.is_authenticated else ''
+            key = _key(cache, 'response', request.get_full_path(), username)
+            cached = cache.get(key)
+            if cached is not None:
+                body, content_type, etag = cached
+                response = HttpResponse(body, content_type=content_type)
+                response['ETag'] = etag
+                return get_conditional_response(request, etag=etag, response=response)
+
+        response = view(request, *args, **kwargs)
+        if response.status_code != 200 or response.streaming or response.cookies:
+            return response
+        etag = body_etag(response.content)
+        response['ETag'] = etag
+        if key is not None:
+            cache.set(key, (response.content, response['Content-Type'], etag), _timeout())
+        return get_conditional_response(request, etag=etag, response=response)
+    return wrapper
+
+
+def cached_value(name, load):
+    """Return the value cached under `name`, calling `load` to compute it on a miss"""
+    cache = _cache()
+    if cache is None:
+        return load()
+    key = _key(cache, name)
+    value = cache.get(key)
+    if value is None:
+        value = load()
+        cache.set(key, value, _timeout())
+    return value
+
+
+@receiver(post_save, sender=Quiz)
+@receiver(post_delete, sender=Quiz)
+def quiz_changed_callback(sender, instance, **kwargs):
+    invalidate()
@@ -0,0 +1,100 @@
+"""
+Read replica routing.
+
+Views decorated with `replica_reads` (leaderboards, quiz listings, the
+profile page) read quizer_game models from one of the DATABASE_REPLICAS
+aliases. Everything else, including every write and the auth and session
+tables, uses the primary database. In-process leaderboards are shared by
+all clients and are always loaded from the primary.
+
+Replicas lag behind the primary, so `ReplicaRoutingMiddleware` pins a
+client to the primary for REPLICA_PIN_SECONDS after a request of that
+client wrote to quizer_game models: a player sees their own vote, game or
+quiz right away. The pin is a signed cookie whose signature carries its
+time, so pinning never writes a session.
+"""
+import functools
+import random
+import threading
+
+from django.conf import settings
+
+APP_LABEL = 'quizer_game'
+PIN_COOKIE = 'quizer_primary'
+PIN_SALT = 'quizer_game.routers.pin'
+DEFAULT_PIN_SECONDS = 10
+
+
+class _State(threading.local):
+    use_replica = False
+    wrote = False
+
+
+state = _State()
+
+
+def replica_aliases() -> list:
+    return list(getattr(settings, 'DATABASE_REPLICAS', []))
+
+
+def pin_seconds() -> int:
+    return getattr(settings, 'REPLICA_PIN_SECONDS', DEFAULT_PIN_SECONDS)
+
+
+def is_pinned(request) -> bool:
+    return request.get_signed_cookie(PIN_COOKIE, default=None, salt=PIN_SALT, max_age=pin_seconds()) is not None
+
+
+def replica_reads(view):
+    """Read quizer_game models of `view` from a replica unless the client is pinned to the primary"""
+    @functools.wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if not replica_aliases() or is_pinned(request):
+            return view(request, *args, **kwargs)
+        state.use_replica = True
+        try:
+            return view(request, *args, **kwargs)
+        finally:
+            state.use_replica = False
+    return wrapper
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label != APP_LABEL or not state.use_replica:
+            return None
+        replicas = replica_aliases()
+        return random.choice(replicas) if replicas else None
+
+    def db_for_write(self, model, **hints):
+        if model._meta.app_label == APP_LABEL:
+            state.wrote = True
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {'default', *replica_aliases()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, **hints):
+        # replicas get their tables from the primary
+        if db in replica_aliases():
+            return False
+        return None
+
+
+class ReplicaRoutingMiddleware:
+    """Pin the client of a request that wrote to the primary database"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        state.wrote = False
+        response = self.get_response(request)
+        if state.wrote and replica_aliases():
+            response.set_signed_cookie(PIN_COOKIE, '1', salt=PIN_SALT, max_age=pin_seconds(),
+                                       httponly=True, samesite='Lax')
+        state.wrote = False
+        return response
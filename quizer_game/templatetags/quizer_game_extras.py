@@ -13,3 +13,13 @@ def mul(value, arg):
 @register.filter(name='times')
 def times(number):
     return range(number)
+
+
+@register.filter
+def duration(value):
+    """Format a timedelta as H:MM:SS.mmm"""
+    milliseconds = int(value.total_seconds() * 1000)
+    seconds, milliseconds = divmod(milliseconds, 1000)
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02}:{seconds:02}.{milliseconds:03}"
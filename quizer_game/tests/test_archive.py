@@ -0,0 +1,55 @@
+from django.core.management import call_command
+from django.test import TestCase
+
+from quizer_game import archive, clock
+from quizer_game.models import Quiz, Player, ArchivedPlayer
+from io import StringIO
+
+NOW = 1_600_000_000_000         # milliseconds since the epoch
+OLD = NOW - 8 * archive.DAY
+
+
+class ArchivePlayersTest(TestCase):
+    def setUp(self) -> None:
+        self.quiz = Quiz.objects.create(topic='Python')
+
+    def test_archive_failed_and_timed_out_players(self):
+        self.quiz.player_set.create(name='Player1', is_failed=True, correct_answer=3, end_point=OLD)
+        self.quiz.player_set.create(name='Player2', is_timeout=True, end_point=OLD)
+        self.assertEqual(archive.archive_players(now=NOW), 2)
+        self.assertFalse(Player.objects.exists())
+        archived = ArchivedPlayer.objects.order_by('name')
+        self.assertEqual([player.outcome for player in archived], [ArchivedPlayer.FAILED, ArchivedPlayer.TIMEOUT])
+        self.assertEqual(archived[0].correct_answer, 3)
+
+    def test_keep_achieved_playing_and_recent_players(self):
+        self.quiz.player_set.create(name='Player1', is_achieved=True, end_point=OLD)
+        self.quiz.player_set.create(name='Player2', is_playing=True, end_point=OLD)
+        self.quiz.player_set.create(name='Player3', is_failed=True, end_point=NOW - archive.DAY)
+        self.assertEqual(archive.archive_players(now=NOW), 0)
+        self.assertEqual(Player.objects.count(), 3)
+
+    def test_keep_players_for_testing(self):
+        """Fixture players are reset by each game, start_game would fail without them"""
+        self.quiz.player_set.create(name='player_test_5_q', is_failed=True, end_point=OLD)
+        self.assertEqual(archive.archive_players(now=NOW), 0)
+        self.assertTrue(Player.objects.filter(name='player_test_5_q').exists())
+
+    def test_archive_in_batches(self):
+        for number in range(5):
+            self.quiz.player_set.create(name=f'Player{number}', is_failed=True, end_point=OLD)
+        self.assertEqual(archive.archive_players(now=NOW, batch_size=2), 5)
+        self.assertEqual(ArchivedPlayer.objects.count(), 5)
+
+    def test_purge_archive(self):
+        ArchivedPlayer.objects.create(quiz=self.quiz, name='Player1', end_point=NOW - 400 * archive.DAY)
+        ArchivedPlayer.objects.create(quiz=self.quiz, name='Player2', end_point=OLD)
+        self.assertEqual(archive.purge_archive(days=365, now=NOW), 1)
+        self.assertEqual(archive.purge_archive(days=0, now=NOW), 0)
+        self.assertEqual(ArchivedPlayer.objects.get().name, 'Player2')
+
+    def test_archive_players_command(self):
+        self.quiz.player_set.create(name='Player1', is_failed=True, end_point=clock.now_ms() - 8 * archive.DAY)
+        out = StringIO()
+        call_command('archive_players', stdout=out)
+        self.assertIn('Archived 1 players, purged 0 archived players', out.getvalue())
@@ -0,0 +1,87 @@
+from django.core.cache import caches
+from django.http import Http404
+from django.test import TestCase, override_settings
+
+from quizer_game import content
+from quizer_game.models import Quiz, Choice
+
+
+class QuizContentTest(TestCase):
+    def setUp(self) -> None:
+        content.clear()
+        self.quiz = Quiz.objects.create(topic='Python')
+        self.question1 = self.quiz.question_set.create(text='Question 1', number=1)
+        self.question2 = self.quiz.question_set.create(text='Question 2', number=2)
+        self.correct = self.question1.choice_set.create(text='Correct', value=1)
+        self.wrong = self.question1.choice_set.create(text='Wrong', value=0)
+
+    def test_content(self):
+        quiz = content.get(self.quiz.id)
+        self.assertEqual(quiz.topic, 'Python')
+        self.assertEqual([question.number for question in quiz.questions], [1, 2])
+        self.assertEqual(quiz.question(self.question1.id).choices[0].text, 'Correct')
+        self.assertEqual(quiz.question_by_number(2).id, self.question2.id)
+        self.assertIsNone(quiz.question_by_number(3))
+
+    def test_choice_value(self):
+        quiz = content.get(self.quiz.id)
+        self.assertEqual(quiz.choice_value(self.correct.id), 1)
+        self.assertEqual(quiz.choice_value(str(self.wrong.id)), 0)
+        self.assertIsNone(quiz.choice_value('abc'))
+        self.assertIsNone(quiz.choice_value(999))
+
+    def test_content_is_cached(self):
+        content.get(self.quiz.id)
+        with self.assertNumQueries(0):
+            content.get(self.quiz.id)
+
+    def test_unknown_quiz(self):
+        with self.assertRaises(Http404):
+            content.get(999)
+
+    def test_saving_question_invalidates_content(self):
+        content.get(self.quiz.id)
+        self.question2.text = 'New question 2'
+        self.question2.save()
+        self.assertEqual(content.get(self.quiz.id).question_by_number(2).text, 'New question 2')
+
+    def test_saving_choice_invalidates_content(self):
+        content.get(self.quiz.id)
+        Choice.objects.create(question=self.question2, text='New choice', value=1)
+        self.assertEqual(len(content.get(self.quiz.id).question_by_number(2).choices), 1)
+
+    def test_deleting_quiz_invalidates_content(self):
+        content.get(self.quiz.id)
+        self.quiz.delete()
+        with self.assertRaises(Http404):
+            content.get(self.quiz.id)
+
+    @override_settings(QUIZ_CONTENT_CACHE_SIZE=1)
+    def test_least_recently_used_quiz_is_evicted(self):
+        quiz2 = Quiz.objects.create(topic='Java')
+        content.get(self.quiz.id)
+        content.get(quiz2.id)
+        with self.assertNumQueries(3):
+            content.get(self.quiz.id)
+
+    @override_settings(QUIZ_CONTENT_CACHE='default',
+                       CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    def test_shared_cache(self):
+        quiz = content.get(self.quiz.id)
+        content.clear()
+        with self.assertNumQueries(0):
+            self.assertEqual(content.get(self.quiz.id), quiz)
+        content.invalidate(self.quiz.id)
+        with self.assertNumQueries(3):
+            content.get(self.quiz.id)
+
+    @override_settings(QUIZ_CONTENT_CACHE='default',
+                       CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    def test_invalidation_in_another_process_is_seen(self):
+        content.get(self.quiz.id)
+        # what invalidate() does in another process, whose LRU is not this one
+        caches['default'].set(f'quizer_game:quiz_content_version:{self.quiz.id}', 'edited', None)
+        with self.assertNumQueries(3):
+            content.get(self.quiz.id)
+        with self.assertNumQueries(0):
+            content.get(self.quiz.id)
@@ -0,0 +1,77 @@
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from quizer_game import counters
+from quizer_game.models import Quiz
+from io import StringIO
+
+
+class CountersTest(TestCase):
+    def setUp(self) -> None:
+        self.quiz = Quiz.objects.create(topic='Python')
+        self.player1 = self.quiz.player_set.create(name='Player1', is_achieved=True)
+        self.player2 = self.quiz.player_set.create(name='Player2', is_achieved=True)
+        self.quiz.player_set.create(name='Player3', is_failed=True)
+
+    def test_rebuild_counts_achieved_players(self):
+        counters.rebuild()
+        self.quiz.refresh_from_db()
+        self.assertEqual(self.quiz.total_player, 2)
+
+    def test_rebuild_quiz_without_players(self):
+        quiz = Quiz.objects.create(topic='Java', finisher_count=10)
+        counters.rebuild()
+        quiz.refresh_from_db()
+        self.assertEqual(quiz.total_player, 0)
+
+    def test_add_finisher(self):
+        counters.add_finisher(self.quiz.id)
+        self.quiz.refresh_from_db()
+        self.assertEqual(self.quiz.finisher_count, 1)
+
+    def test_quitting_achieved_player_decreases_counter(self):
+        counters.rebuild()
+        url = reverse('quizer_game:quit-game',
+                      kwargs={'player_id': self.player1.id,
+                              'quiz_id': self.quiz.id,
+                              'selected_difficulty': self.player1.selected_difficulty
+                              }
+                      )
+        self.client.get(url)
+        self.quiz.refresh_from_db()
+        self.assertEqual(self.quiz.finisher_count, 1)
+
+    def test_deleting_achieved_player_in_admin_decreases_counter(self):
+        counters.rebuild()
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'password'))
+        self.client.post(reverse('admin:quizer_game_player_delete', args=[self.player1.id]), {'post': 'yes'})
+        self.quiz.refresh_from_db()
+        self.assertEqual(self.quiz.finisher_count, 1)
+
+    def test_deleting_players_in_admin_decreases_counter(self):
+        counters.rebuild()
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'password'))
+        self.client.post(reverse('admin:quizer_game_player_changelist'),
+                         {'action': 'delete_selected', 'post': 'yes',
+                          '_selected_action': [player.id for player in self.quiz.player_set.all()]})
+        self.quiz.refresh_from_db()
+        self.assertEqual(self.quiz.finisher_count, 0)
+        self.assertFalse(self.quiz.player_set.exists())
+
+    def test_deleting_quiz_doesnt_load_its_players(self):
+        """Players of a deleted quiz are deleted in bulk, not one by one"""
+        self.quiz.player_set.bulk_create(self.quiz.player_set.model(quiz=self.quiz, name=f'Finisher{number}',
+                                                                    is_achieved=True)
+                                         for number in range(200))
+        # questions, players, archived players, quiz
+        with self.assertNumQueries(4):
+            self.quiz.delete()
+
+    def test_rebuild_counters_command(self):
+        out = StringIO()
+        call_command('rebuild_counters', stdout=out)
+        self.quiz.refresh_from_db()
+        self.assertEqual(self.quiz.finisher_count, 2)
+        self.assertIn('Rebuilt counters of 1 quizzes', out.getvalue())
@@ -0,0 +1,68 @@
+from unittest import mock
+
+from django.conf import settings
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from psycopg2 import extensions, pool
+
+from quizer_site.postgresql_pool import base as postgresql_pool
+
+
+class SQLiteTuningTest(TestCase):
+    def test_sqlite_uses_wal_and_normal_sync(self):
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA synchronous')
+            self.assertEqual(cursor.fetchone()[0], 1)
+            cursor.execute('PRAGMA journal_mode')
+            # the in-memory test database can't use a write-ahead log
+            self.assertIn(cursor.fetchone()[0], ('wal', 'memory'))
+
+    def test_sqlite_waits_for_locks(self):
+        self.assertEqual(settings.DATABASES['default']['OPTIONS']['timeout'], settings.DB_SQLITE_BUSY_TIMEOUT)
+
+
+@mock.patch('quizer_site.postgresql_pool.base.pool.ThreadedConnectionPool')
+class PostgreSQLPoolTest(SimpleTestCase):
+    def setUp(self) -> None:
+        postgresql_pool._pools.clear()
+        self.wrapper = postgresql_pool.DatabaseWrapper({'NAME': 'quizer', 'OPTIONS': {}, 'POOL_SIZE': 4}, 'pooled')
+
+    def tearDown(self) -> None:
+        postgresql_pool._pools.clear()
+        postgresql_pool._slots.clear()
+
+    def test_connections_come_from_pool(self, pool_class):
+        pooled = pool_class.return_value.getconn.return_value
+        pooled.closed = False
+        self.assertIs(self.wrapper.get_new_connection({'dbname': 'quizer'}), pooled)
+        self.wrapper.get_new_connection({'dbname': 'quizer'})
+        pool_class.assert_called_once_with(1, 4, dbname='quizer')
+
+    def test_threads_wait_for_a_free_connection(self, pool_class):
+        pool_class.return_value.getconn.return_value = pooled = mock.Mock(closed=False)
+        pooled.get_transaction_status.return_value = extensions.TRANSACTION_STATUS_IDLE
+        wrapper = postgresql_pool.DatabaseWrapper({'NAME': 'quizer', 'OPTIONS': {}, 'POOL_SIZE': 1,
+                                                   'POOL_TIMEOUT': 0.01}, 'pooled')
+        wrapper.connection = wrapper.get_new_connection({'dbname': 'quizer'})
+        # the only connection is taken: wait instead of the pool's PoolError, then give up
+        with self.assertRaises(pool.PoolError):
+            wrapper.get_new_connection({'dbname': 'quizer'})
+        pool_class.return_value.getconn.assert_called_once_with()
+        wrapper._close()
+        self.assertIs(wrapper.get_new_connection({'dbname': 'quizer'}), pooled)
+
+    def test_close_returns_connection_to_pool(self, pool_class):
+        self.wrapper.connection = pooled = mock.Mock(closed=False)
+        pooled.get_transaction_status.return_value = extensions.TRANSACTION_STATUS_IDLE
+        postgresql_pool.get_pool('pooled', {}, {})
+        postgresql_pool.take_slot('pooled', {})
+        self.wrapper._close()
+        pool_class.return_value.putconn.assert_called_once_with(pooled, close=False)
+
+    def test_close_discards_connection_in_transaction(self, pool_class):
+        self.wrapper.connection = pooled = mock.Mock(closed=False)
+        pooled.get_transaction_status.return_value = extensions.TRANSACTION_STATUS_INERROR
+        postgresql_pool.get_pool('pooled', {}, {})
+        postgresql_pool.take_slot('pooled', {})
+        self.wrapper._close()
+        pool_class.return_value.putconn.assert_called_once_with(pooled, close=True)
@@ -0,0 +1,89 @@
+import tempfile
+from datetime import timedelta
+from django.core.cache import caches
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from quizer_game import engine, expiry, game_state
+from quizer_game.models import Quiz, DIFFICULTY
+from io import StringIO
+
+NOW = 1_600_000_000_000         # milliseconds since the epoch
+GAME_STATE_CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+    'game_state': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+                   'LOCATION': tempfile.mkdtemp(prefix='quizer-expiry-')},
+}
+
+
+class ExpireGamesTest(TestCase):
+    def setUp(self) -> None:
+        self.quiz = Quiz.objects.create(topic='Python')
+
+    def create_player(self, name, difficulty, expires_at, is_playing=True):
+        return self.quiz.player_set.create(name=name, selected_difficulty=DIFFICULTY[difficulty],
+                                           is_playing=is_playing, start_point=NOW - 70_000,
+                                           time_limit=timedelta(seconds=60), expires_at=expires_at)
+
+    def test_hard_game_past_time_limit_times_out(self):
+        player = self.create_player('Player1', 'hard', NOW - 10_000)
+        result = expiry.expire_games(now=NOW)
+        player.refresh_from_db()
+        self.assertEqual(result, {'timeout': 1, 'failed': 0})
+        self.assertTrue(player.is_timeout)
+        self.assertFalse(player.is_playing)
+        self.assertIsNone(player.expires_at)
+        self.assertEqual(player.time, timedelta(seconds=60))
+        self.assertEqual(player.end_point, NOW - 10_000)
+
+    def test_idle_easy_game_fails(self):
+        player = self.create_player('Player1', 'easy', NOW)
+        result = expiry.expire_games(now=NOW)
+        player.refresh_from_db()
+        self.assertEqual(result, {'timeout': 0, 'failed': 1})
+        self.assertTrue(player.is_failed)
+        self.assertFalse(player.is_playing)
+
+    def test_turn_saved_after_expiry_does_not_revive_game(self):
+        player = self.create_player('Player1', 'easy', NOW)
+        expiry.expire_games(now=NOW)
+        player.position = 1
+        with self.assertRaises(engine.GameOver):
+            engine.save_turn(player, engine.NEXT_QUESTION)
+        player.refresh_from_db()
+        self.assertFalse(player.is_playing)
+        self.assertTrue(player.is_failed)
+        self.assertEqual(player.position, 0)
+
+    def test_games_before_deadline_are_kept(self):
+        player = self.create_player('Player1', 'medium', NOW + 1)
+        finished = self.create_player('Player2', 'hard', NOW - 1, is_playing=False)
+        self.assertEqual(expiry.expire_games(now=NOW), {'timeout': 0, 'failed': 0})
+        player.refresh_from_db()
+        finished.refresh_from_db()
+        self.assertTrue(player.is_playing)
+        self.assertFalse(finished.is_timeout)
+
+    def test_expires_in_batches(self):
+        for number in range(5):
+            self.create_player(f'Player{number}', 'easy', NOW - number)
+        with self.assertNumQueries(3 * 4 + 1):
+            result = expiry.expire_games(now=NOW, batch_size=2)
+        self.assertEqual(result['failed'], 5)
+
+    @override_settings(CACHES=GAME_STATE_CACHES, GAME_STATE_CACHE='game_state')
+    def test_game_continued_in_cache_is_kept(self):
+        player = self.create_player('Player1', 'easy', NOW - 1)
+        player.expires_at = NOW + 60_000
+        game_state.save(player)
+        self.assertEqual(expiry.expire_games(now=NOW)['failed'], 0)
+        player.refresh_from_db()
+        self.assertTrue(player.is_playing)
+        self.assertEqual(player.expires_at, NOW + 60_000)
+        caches['game_state'].clear()
+
+    def test_expire_games_command(self):
+        self.create_player('Player1', 'hard', 0)
+        out = StringIO()
+        call_command('expire_games', stdout=out)
+        self.assertIn('Expired 1 timed out and 0 failed games', out.getvalue())
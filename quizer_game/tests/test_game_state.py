@@ -0,0 +1,84 @@
+import tempfile
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from quizer_game import content, game_state
+from quizer_game.models import Quiz, Player
+
+GAME_STATE_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+                                 'LOCATION': tempfile.mkdtemp(prefix='quizer-game-state-')}}
+
+
+@override_settings(GAME_STATE_CACHE='default', CACHES=GAME_STATE_CACHES)
+class GameStateTest(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.quiz = Quiz.objects.create(topic='Python')
+        for number in range(1, 4):
+            question = self.quiz.question_set.create(text=f'Question {number}', number=number)
+            question.choice_set.create(text='Correct', value=1)
+            question.choice_set.create(text='Wrong', value=0)
+
+        url = reverse('quizer_game:start-game', args=('Player1',))
+        self.client.post(url, data={'quiz_id': self.quiz.id, 'difficulty': 'easy'})
+        self.player = Player.objects.get(name='Player1')
+        self.kwargs = {'player_id': self.player.id, 'quiz_id': self.quiz.id, 'selected_difficulty': 0}
+
+    def answer(self, question_number, value=1):
+        question = self.quiz.question_set.get(number=question_number)
+        choice = question.choice_set.get(value=value)
+        return self.client.post(reverse('quizer_game:update', kwargs=self.kwargs),
+                                data={'choice_id': choice.id})
+
+    def test_answer_is_not_written_to_database(self):
+        """
+        An answer of a game in progress only changes the game state store
+        """
+        self.answer(1)
+        content.get(self.quiz.id)
+        question2 = self.quiz.question_set.get(number=2)
+        choice = question2.choice_set.get(value=1)
+        with self.assertNumQueries(0):
+            self.client.post(reverse('quizer_game:update', kwargs=self.kwargs),
+                             data={'choice_id': choice.id})
+        self.player.refresh_from_db()
+        self.assertEqual(self.player.position, 0)
+
+    def test_game_is_served_from_store(self):
+        self.answer(1)
+        content.get(self.quiz.id)
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('quizer_game:game', kwargs=self.kwargs))
+        self.assertEqual(response.context['player'].position, 1)
+        self.assertContains(response, 'Question 2')
+
+    def test_game_end_is_written_to_database(self):
+        """
+        When the player answers the last question, the game is saved to the database
+        """
+        self.answer(1)
+        self.answer(2, value=0)
+        response = self.answer(3)
+        self.assertRedirects(response, reverse('quizer_game:result', kwargs=self.kwargs))
+        self.player.refresh_from_db()
+        self.assertTrue(self.player.is_failed)
+        self.assertFalse(self.player.is_playing)
+        self.assertEqual(self.player.correct_answer, 2)
+        self.assertEqual(self.player.wrong_answer, 1)
+        self.assertIsNone(cache.get(f'quizer_game:game_state:{self.player.id}'))
+
+    def test_quit_removes_state(self):
+        self.answer(1)
+        self.client.get(reverse('quizer_game:quit-game', kwargs=self.kwargs))
+        self.assertIsNone(cache.get(f'quizer_game:game_state:{self.player.id}'))
+        self.assertFalse(Player.objects.filter(pk=self.player.id).exists())
+
+
+@override_settings(GAME_STATE_CACHE='default',
+                   CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class LocalMemoryGameStateTest(TestCase):
+    def test_local_memory_cache_is_rejected(self):
+        with self.assertRaises(ImproperlyConfigured):
+            game_state.enabled()
@@ -0,0 +1,96 @@
+from unittest import mock
+
+from django.test import TestCase, override_settings
+
+from quizer_game import leaderboards
+from quizer_game.models import Quiz, Player
+from datetime import timedelta
+
+
+def create_achieved_player(quiz: Quiz, player_name: str, time, selected_difficulty=0) -> Player:
+    player = quiz.player_set.create(name=player_name, time=time,
+                                    selected_difficulty=selected_difficulty)
+    player.is_achieved = True
+    player.save()
+    return player
+
+
+class LeaderboardsTest(TestCase):
+    def setUp(self) -> None:
+        leaderboards.clear()
+        self.quiz = Quiz.objects.create(topic='Python')
+        self.player1 = create_achieved_player(self.quiz, 'Player1', time=timedelta(seconds=500))
+        self.player2 = create_achieved_player(self.quiz, 'Player2', time=timedelta(seconds=600))
+        self.player3 = create_achieved_player(self.quiz, 'Player3', time=timedelta(seconds=700))
+
+    def test_top_players_are_sorted_by_time(self):
+        board = leaderboards.get(self.quiz.id, 0)
+        self.assertEqual([player.name for player in board.top(2)], ['Player1', 'Player2'])
+
+    def test_rank(self):
+        board = leaderboards.get(self.quiz.id, 0)
+        self.assertEqual(board.rank(self.player1.id), 1)
+        self.assertEqual(board.rank(self.player3.id), 3)
+
+    def test_players_with_same_time_are_ordered_by_id(self):
+        player4 = create_achieved_player(self.quiz, 'Player4', time=timedelta(seconds=500))
+        board = leaderboards.get(self.quiz.id, 0)
+        self.assertEqual(board.rank(player4.id), 2)
+
+    def test_board_is_loaded_once(self):
+        leaderboards.get(self.quiz.id, 0)
+        with self.assertNumQueries(0):
+            leaderboards.get(self.quiz.id, 0)
+
+    def test_achieved_player_is_added_to_loaded_board(self):
+        board = leaderboards.get(self.quiz.id, 0)
+        player4 = create_achieved_player(self.quiz, 'Player4', time=timedelta(seconds=400))
+        self.assertEqual(board.rank(player4.id), 1)
+        self.assertEqual(len(board), 4)
+
+    def test_player_is_moved_when_difficulty_changes(self):
+        easy_board = leaderboards.get(self.quiz.id, 0)
+        hard_board = leaderboards.get(self.quiz.id, 2)
+        self.player2.selected_difficulty = 2
+        self.player2.save()
+        self.assertIsNone(easy_board.rank(self.player2.id))
+        self.assertEqual(hard_board.rank(self.player2.id), 1)
+
+    def test_discarded_player_is_removed(self):
+        board = leaderboards.get(self.quiz.id, 0)
+        leaderboards.discard(self.player1)
+        self.assertIsNone(board.rank(self.player1.id))
+        self.assertEqual(board.rank(self.player2.id), 1)
+
+    @override_settings(LEADERBOARD_CACHE_SIZE=2)
+    def test_least_recently_read_board_is_dropped(self):
+        board = leaderboards.get(self.quiz.id, 0)
+        leaderboards.get(self.quiz.id, 1)
+        leaderboards.get(self.quiz.id, 0)
+        leaderboards.get(self.quiz.id, 2)
+        self.assertIs(leaderboards.loaded(self.quiz.id, 0), board)
+        self.assertIsNone(leaderboards.loaded(self.quiz.id, 1))
+        self.assertIsNotNone(leaderboards.loaded(self.quiz.id, 2))
+
+    @override_settings(LEADERBOARD_REFRESH_SECONDS=0)
+    def test_stale_board_is_reloaded(self):
+        board = leaderboards.get(self.quiz.id, 0)
+        self.assertIsNot(leaderboards.get(self.quiz.id, 0), board)
+
+    @override_settings(LEADERBOARD_REFRESH_SECONDS=0)
+    def test_stale_board_serves_pages_while_it_is_reloaded(self):
+        old_board = leaderboards.get(self.quiz.id, 0)
+        load = leaderboards.load
+
+        def slow_load(quiz_id, difficulty):
+            board = load(quiz_id, difficulty)
+            # other requests keep the stale board and a player finishes before the swap
+            self.assertIs(leaderboards.get(quiz_id, difficulty), old_board)
+            self.player4 = create_achieved_player(self.quiz, 'Player4', time=timedelta(seconds=400))
+            return board
+
+        with mock.patch.object(leaderboards, 'load', slow_load):
+            board = leaderboards.get(self.quiz.id, 0)
+        self.assertIsNot(board, old_board)
+        self.assertEqual(board.rank(self.player4.id), 1)
+        self.assertEqual(len(board), 4)
@@ -0,0 +1,92 @@
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+
+from quizer_game import engine, leaderboards, live
+from quizer_game.models import Quiz, DIFFICULTY
+from datetime import timedelta
+
+
+class LocalBrokerTest(TestCase):
+    def setUp(self) -> None:
+        self.broker = live.LocalBroker()
+
+    def test_publish_to_subscribers_of_channel(self):
+        events = self.broker.subscribe('a')
+        other_events = self.broker.subscribe('b')
+        self.assertEqual(self.broker.publish('a', {'rank': 1}), 1)
+        self.assertEqual(events.get_nowait(), {'rank': 1})
+        self.assertTrue(other_events.empty())
+
+    def test_unsubscribe(self):
+        events = self.broker.subscribe('a')
+        self.broker.unsubscribe('a', events)
+        self.assertEqual(self.broker.publish('a', {'rank': 1}), 0)
+
+    def test_full_queue_drops_events(self):
+        events = self.broker.subscribe('a')
+        for rank in range(live.QUEUE_SIZE + 1):
+            self.broker.publish('a', {'rank': rank})
+        self.assertEqual(events.qsize(), live.QUEUE_SIZE)
+
+
+class PublishFinisherTest(TransactionTestCase):
+    def setUp(self) -> None:
+        leaderboards.clear()
+        self.quiz = Quiz.objects.create(topic='Python')
+        self.quiz.player_set.create(name='Player1', is_achieved=True, time=timedelta(seconds=5))
+        self.question = self.quiz.question_set.create(text='Question 1', number=1)
+        self.choice = self.question.choice_set.create(text='Correct', value=1)
+        self.player = self.quiz.player_set.create(name='Player2', is_playing=True, position=14,
+                                                  current_question=self.question)
+        self.player.start_timer()
+        self.events = live.broker().subscribe(live.channel(self.quiz.id, DIFFICULTY['easy']))
+
+    def tearDown(self) -> None:
+        live.broker().unsubscribe(live.channel(self.quiz.id, DIFFICULTY['easy']), self.events)
+
+    def test_finisher_is_published_with_rank(self):
+        leaderboards.get(self.quiz.id, DIFFICULTY['easy'])
+        turn = engine.load_turn(self.quiz.id, self.player.id, self.choice.id)
+        self.assertEqual(engine.play_turn(turn), engine.ACHIEVED)
+        event = self.events.get_nowait()
+        self.assertEqual(event['name'], 'Player2')
+        self.assertEqual(event['rank'], 1)
+        self.assertEqual(event['total_answer'], 1)
+
+    def test_publishing_doesnt_load_the_board(self):
+        with self.assertNumQueries(0):
+            live.publish_finisher(self.player)
+        self.assertIsNone(self.events.get_nowait()['rank'])
+
+
+@override_settings(LIVE_KEEPALIVE_SECONDS=1, LIVE_STREAM_SECONDS=1)
+class LeaderboardLiveTest(TestCase):
+    def setUp(self) -> None:
+        self.quiz = Quiz.objects.create(topic='Python')
+        self.url = reverse('quizer_game:leaderboard-live', args=(self.quiz.id, DIFFICULTY['easy']))
+
+    def test_stream_events(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        chunks = iter(response.streaming_content)
+        self.assertEqual(next(chunks), b'retry: 1000\n\n')
+        live.broker().publish(live.channel(self.quiz.id, DIFFICULTY['easy']), {'rank': 1})
+        self.assertEqual(next(chunks), b'event: finisher\ndata: {"rank": 1}\n\n')
+        self.assertEqual(list(chunks), [])
+
+    def test_unknown_quiz(self):
+        response = self.client.get(reverse('quizer_game:leaderboard-live', args=(self.quiz.id + 1, 0)))
+        self.assertEqual(response.status_code, 404)
+
+    @override_settings(LIVE_MAX_STREAMS=1)
+    def test_streams_over_the_limit_are_refused(self):
+        response = self.client.get(self.url)
+        busy = self.client.get(self.url)
+        self.assertEqual(busy.status_code, 503)
+        self.assertEqual(busy['Retry-After'], '1')
+        self.assertEqual(busy.content, b'retry: 1000\n\n')
+        # closing a stream gives its slot back
+        response.close()
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        response.close()
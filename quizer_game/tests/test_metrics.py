@@ -0,0 +1,50 @@
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from quizer_game import metrics, page_cache
+from quizer_game.models import Quiz
+
+
+class HistogramTest(TestCase):
+    def test_values_fall_in_buckets(self):
+        histogram = metrics.Histogram([1, 10])
+        for value in (0, 1, 5, 50):
+            histogram.add(value)
+        self.assertEqual(histogram.as_dict(), {'buckets': {'<=1': 2, '<=10': 1, '>10': 1},
+                                               'mean': 14.0, 'max': 50})
+
+
+class RequestMetricsTest(TestCase):
+    def setUp(self) -> None:
+        metrics.clear()
+        page_cache.invalidate()
+        Quiz.objects.create(topic='Python')
+
+    def test_requests_are_recorded_by_url_name(self):
+        self.client.get(reverse('quizer_game:quiz-index'))
+        self.client.get(reverse('quizer_game:quiz-index'))
+        quiz_index = metrics.snapshot()['quizer_game:quiz-index']
+        self.assertEqual(quiz_index['requests'], 2)
+        # the first request reads the quizzes, the second one is served from the page cache
+        self.assertEqual(quiz_index['queries']['max'], 1)
+        self.assertEqual(quiz_index['queries']['mean'], 0.5)
+        self.assertGreater(quiz_index['template_ms']['max'], 0)
+
+    def test_server_timing_header(self):
+        with override_settings(SERVER_TIMING=True):
+            response = self.client.get(reverse('quizer_game:quiz-index'))
+        self.assertRegex(response['Server-Timing'], r'^db;dur=[\d.]+;desc="1 queries", tpl;dur=[\d.]+, total;dur=')
+        self.assertFalse(self.client.get(reverse('quizer_game:index')).has_header('Server-Timing'))
+
+    @override_settings(REQUEST_METRICS=False)
+    def test_metrics_can_be_turned_off(self):
+        self.client.get(reverse('quizer_game:quiz-index'))
+        self.assertEqual(metrics.snapshot(), {})
+
+    def test_metrics_view_is_for_staff(self):
+        url = reverse('quizer_game:request-metrics')
+        self.assertEqual(self.client.get(url).status_code, 302)
+        self.client.force_login(User.objects.create_user('admin', is_staff=True))
+        self.client.get(reverse('quizer_game:index'))
+        self.assertIn('quizer_game:index', self.client.get(url).json())
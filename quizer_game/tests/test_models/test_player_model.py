@@ -1,5 +1,5 @@
 from django.test import TestCase
-from quizer_game.models import Quiz, Question, Choice, Player, Timer
+from quizer_game.models import Quiz, Question, Choice, Player
 
 
 class PlayerModelTest(TestCase):
@@ -15,8 +15,7 @@ class PlayerModelTest(TestCase):
         question = Question.objects.create(quiz=quiz, text='What is str?', number=1)
         self.player = Player.objects.create(quiz=quiz, current_question=question,
                                             name='Player2', selected_difficulty=0)
-        self.timer = self.player.timer_set.create()
-        self.timer.start()
+        self.player.start_timer()
 
     def test_quiz_label(self):
         """
@@ -161,8 +160,8 @@ class PlayerModelTest(TestCase):
         self.assertEquals(self.player.position, old_position - 1)
 
     def test_save_time_duration(self):
-        self.timer.stop()
-        time_duration = self.timer.time_duration
+        self.player.stop_timer()
+        time_duration = self.player.time_duration
         self.player.save_time_duration()
         self.assertEqual(self.player.time, time_duration)
 
@@ -1,3 +1,4 @@
+from django.db import IntegrityError
 from django.test import TestCase
 from quizer_game.models import Quiz, Question
 
@@ -47,3 +48,11 @@ class QuestionModelTest(TestCase):
         question = Question.objects.get(id=1)
         field_default = question._meta.get_field('number').default
         self.assertEquals(field_default, 0)
+
+    def test_number_is_unique_in_quiz(self):
+        """
+        Two questions of the same quiz can not have the same number
+        """
+        quiz = Question.objects.get(id=1).quiz
+        with self.assertRaises(IntegrityError):
+            Question.objects.create(quiz=quiz, text='What is int?', number=1)
@@ -40,3 +40,14 @@ class QuizModelTest(TestCase):
         quiz = Quiz.objects.get(id=1)
         field_max_length = quiz._meta.get_field('topic').max_length
         self.assertEquals(field_max_length, 200)
+
+
+class QuizFixtureTest(TestCase):
+    fixtures = ['quiz_and_player.json']
+
+    def test_fixture_loads(self):
+        """
+        Test that the fixture of README step 8 has every required field
+        """
+        self.assertEqual(Quiz.objects.count(), 4)
+        self.assertTrue(Player.objects.filter(name='player_test_5_q').exists())
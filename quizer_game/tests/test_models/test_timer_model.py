@@ -1,53 +1,66 @@
 from django.test import TestCase
-from quizer_game.models import Quiz, Question, Player, Timer
+from unittest import mock
+from quizer_game import clock
+from quizer_game.models import Quiz, Question, Player
 import time
 from datetime import timedelta
 
 
-class TimerModelTest(TestCase):
-    @classmethod
-    def setUpTestData(cls):
-        quiz = Quiz.objects.create(topic='Python Programming')
-        question = Question.objects.create(quiz=quiz,
-                                           text='What is str?',
-                                           number=1)
-        player = Player.objects.create(quiz=quiz,
-                                       current_question=question,
-                                       name='Player1',
-                                       selected_difficulty=0)
-        Timer.objects.create(player=player)
-
+class PlayerTimerTest(TestCase):
     def setUp(self) -> None:
         quiz = Quiz.objects.create(topic='Python Programming')
         question = Question.objects.create(quiz=quiz,
                                            text='What is str?',
                                            number=1)
-        player = Player.objects.create(quiz=quiz,
-                                       current_question=question,
-                                       name='Player2',
-                                       selected_difficulty=0)
-        self.timer = player.timer_set.create()
-
-    def test_timer_name_should_end_with_its_player_name(self):
-        timer = Timer.objects.get(id=1)
-        self.assertEqual(str(timer), 'A timer of Player1')
-
-    def test_start(self):
-        default_value = self.timer._meta.get_field('start_point').default
-        self.timer.start()
-        self.assertNotEqual(self.timer.start_point, default_value)
-
-    def test_stop(self):
-        default_value = self.timer._meta.get_field('end_point').default
-        self.timer.stop()
-        self.assertNotEqual(self.timer.end_point, default_value)
+        self.player = Player.objects.create(quiz=quiz,
+                                            current_question=question,
+                                            name='Player2',
+                                            selected_difficulty=0)
+
+    def test_start_timer(self):
+        default_value = self.player._meta.get_field('start_point').default
+        self.player.start_timer()
+        self.assertNotEqual(self.player.start_point, default_value)
+
+    def test_stop_timer(self):
+        default_value = self.player._meta.get_field('end_point').default
+        self.player.stop_timer()
+        self.assertNotEqual(self.player.end_point, default_value)
+
+    def test_stop_timer_without_saving(self):
+        self.player.stop_timer(commit=False)
+        self.player.refresh_from_db()
+        self.assertEqual(self.player.end_point, 0)
 
     def test_time_duration(self):
-        self.timer.start()
-        time.sleep(5)
-        self.timer.stop()
-        self.assertEqual(self.timer.time_duration, timedelta(seconds=5))
+        self.player.start_timer()
+        time.sleep(0.25)
+        self.player.stop_timer()
+        self.assertGreaterEqual(self.player.time_duration, timedelta(milliseconds=250))
+        self.assertLess(self.player.time_duration, timedelta(milliseconds=350))
+
+    def test_time_duration_has_millisecond_precision(self):
+        self.player.start_point = 1000
+        self.player.end_point = 3456
+        self.assertEqual(self.player.time_duration, timedelta(seconds=2, milliseconds=456))
+
+    def test_time_duration_ignores_wall_clock_changes(self):
+        """
+        The duration is measured with the monotonic clock when the game stops on the same clock
+        """
+        self.player.start_timer()
+        with mock.patch('quizer_game.clock.now_ms', return_value=clock.now_ms() + 3600 * 1000):
+            self.player.stop_timer()
+        self.assertLess(self.player.time_duration, timedelta(seconds=1))
+
+    def test_time_duration_uses_wall_clock_on_another_clock(self):
+        self.player.start_timer()
+        self.player.clock_id = 'another-server'
+        with mock.patch('quizer_game.clock.now_ms', return_value=self.player.start_point + 5000):
+            self.player.stop_timer()
+        self.assertEqual(self.player.time_duration, timedelta(seconds=5))
 
     def test_set_time_limit(self):
-        self.timer.set_time_limit(seconds=50)
-        self.assertEqual(self.timer.time_limit, timedelta(seconds=50))
+        self.player.set_time_limit(seconds=50)
+        self.player.refresh_from_db()
+        self.assertEqual(self.player.time_limit, timedelta(seconds=50))
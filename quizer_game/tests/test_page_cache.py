@@ -0,0 +1,70 @@
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from quizer_game import page_cache
+from quizer_game.models import Quiz
+
+
+class PageCacheTest(TestCase):
+    def setUp(self) -> None:
+        page_cache.invalidate()
+        self.quiz = Quiz.objects.create(topic='Python')
+        self.url = reverse('quizer_game:quiz-index')
+
+    def test_cached_page_makes_no_query(self):
+        self.client.get(self.url)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertContains(response, 'Python')
+
+    def test_etag_is_the_digest_of_the_cached_body(self):
+        etag = self.client.get(self.url)['ETag']
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        page_cache.invalidate()
+        Quiz.objects.filter(pk=self.quiz.pk).update(topic='Python 3')
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_creating_quiz_invalidates_pages(self):
+        self.client.get(self.url)
+        Quiz.objects.create(topic='Java')
+        self.assertContains(self.client.get(self.url), 'Java')
+
+    def test_editing_quiz_invalidates_pages(self):
+        self.client.get(self.url)
+        self.quiz.topic = 'Python 3'
+        self.quiz.save()
+        self.assertContains(self.client.get(self.url), 'Python 3')
+
+    def test_deleting_quiz_invalidates_pages(self):
+        self.client.get(self.url)
+        self.quiz.delete()
+        self.assertNotContains(self.client.get(self.url), 'Python')
+
+    def test_vote_invalidates_pages(self):
+        player = self.quiz.player_set.create(name='Player1')
+        self.client.get(self.url)
+        self.client.get(reverse('quizer_game:upvote-downvote',
+                                kwargs={'player_id': player.id, 'quiz_id': self.quiz.id,
+                                        'selected_difficulty': 0, 'code': 1}))
+        response = self.client.get(self.url)
+        self.assertEqual(response.context['quizzes'][0].upvotes, 1)
+
+    def test_pages_are_cached_per_user(self):
+        self.client.get(self.url)
+        user = User.objects.create_user('player@example.com', password='secret')
+        self.client.force_login(user)
+        self.assertContains(self.client.get(self.url), 'player@example.com')
+
+    @override_settings(PAGE_CACHE='')
+    def test_cache_can_be_turned_off(self):
+        etag = self.client.get(self.url)['ETag']
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_quiz_level_caches_quiz_lists(self):
+        self.client.post(reverse('quizer_game:quiz-level'), data={'player_name': 'Player1'})
+        with self.assertNumQueries(0):
+            response = self.client.post(reverse('quizer_game:quiz-level'), data={'player_name': 'Player1'})
+        self.assertContains(response, 'Python')
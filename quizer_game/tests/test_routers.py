@@ -0,0 +1,103 @@
+import time
+from unittest import mock, skipUnless
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.contrib.sessions.backends.signed_cookies import SessionStore
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+
+from quizer_game import leaderboards, page_cache, routers
+from quizer_game.models import Quiz
+
+router = routers.ReplicaRouter()
+
+
+@routers.replica_reads
+def read_view(request):
+    """Answer with the databases a quizer_game and an auth read would use"""
+    return HttpResponse(f'{router.db_for_read(Quiz)} {router.db_for_read(User)}')
+
+
+@override_settings(DATABASE_REPLICAS=['replica1'])
+class ReplicaRouterTest(SimpleTestCase):
+    def setUp(self) -> None:
+        self.request = RequestFactory().get('/')
+        self.request.session = SessionStore()
+
+    def test_read_views_read_from_replica(self):
+        self.assertEqual(read_view(self.request).content, b'replica1 None')
+
+    def test_other_views_read_from_primary(self):
+        self.assertIsNone(router.db_for_read(Quiz))
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_without_replicas(self):
+        self.assertEqual(read_view(self.request).content, b'None None')
+
+    def test_writes_go_to_primary(self):
+        self.assertEqual(router.db_for_write(Quiz), 'default')
+
+    def test_no_migrations_on_replicas(self):
+        self.assertFalse(router.allow_migrate('replica1', 'quizer_game'))
+        self.assertIsNone(router.allow_migrate('default', 'quizer_game'))
+
+    def test_write_pins_client_to_primary(self):
+        def write_view(request):
+            router.db_for_write(Quiz)
+            return HttpResponse()
+
+        response = routers.ReplicaRoutingMiddleware(write_view)(self.request)
+        cookie = response.cookies[routers.PIN_COOKIE]
+        self.assertEqual(cookie['max-age'], settings.REPLICA_PIN_SECONDS)
+        self.assertTrue(cookie['httponly'])
+        self.assertFalse(self.request.session.modified)
+        self.request.COOKIES[routers.PIN_COOKIE] = cookie.value
+        self.assertEqual(read_view(self.request).content, b'None None')
+
+    def test_read_does_not_pin_client(self):
+        response = routers.ReplicaRoutingMiddleware(read_view)(self.request)
+        self.assertNotIn(routers.PIN_COOKIE, response.cookies)
+
+    def test_pin_expires(self):
+        response = HttpResponse()
+        with mock.patch('django.core.signing.time.time', return_value=time.time() - settings.REPLICA_PIN_SECONDS - 1):
+            response.set_signed_cookie(routers.PIN_COOKIE, '1', salt=routers.PIN_SALT)
+        self.request.COOKIES[routers.PIN_COOKIE] = response.cookies[routers.PIN_COOKIE].value
+        self.assertEqual(read_view(self.request).content, b'replica1 None')
+
+    def test_forged_pin_is_ignored(self):
+        self.request.COOKIES[routers.PIN_COOKIE] = '1'
+        self.assertEqual(read_view(self.request).content, b'replica1 None')
+
+
+@skipUnless('replica1' in settings.DATABASES, 'set DATABASE_REPLICA_URLS to test with a replica database')
+class ReplicaDatabaseTest(TransactionTestCase):
+    """Run with DATABASE_REPLICA_URLS=sqlite:///replica.sqlite3, the test replica mirrors the test database"""
+    databases = {'default', 'replica1'}
+
+    def setUp(self) -> None:
+        page_cache.invalidate()
+
+    def test_leaderboard_index_reads_from_replica(self):
+        Quiz.objects.create(topic='Python')
+        with self.assertNumQueries(0, using='default'), self.assertNumQueries(1, using='replica1'):
+            response = self.client.get(reverse('quizer_game:leaderboard-index'))
+        self.assertContains(response, 'Python')
+
+    def test_leaderboard_is_loaded_from_primary(self):
+        quiz = Quiz.objects.create(topic='Python')
+        leaderboards.clear()
+        with self.assertNumQueries(1, using='default'):
+            self.client.get(reverse('quizer_game:leaderboard',
+                                    kwargs={'quiz_id': quiz.id, 'selected_difficulty': 0}))
+
+    def test_client_reads_from_primary_after_a_vote(self):
+        quiz = Quiz.objects.create(topic='Python')
+        player = quiz.player_set.create(name='Player1')
+        self.client.get(reverse('quizer_game:upvote-downvote',
+                                kwargs={'player_id': player.id, 'quiz_id': quiz.id,
+                                        'selected_difficulty': 0, 'code': 1}))
+        with self.assertNumQueries(0, using='replica1'):
+            self.client.get(reverse('quizer_game:leaderboard-index'))
@@ -0,0 +1,78 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+
+from quizer_game import counters, leaderboards, page_cache
+from quizer_game.models import Quiz, DIFFICULTY
+from datetime import timedelta
+
+
+class ConditionalGetTest(TestCase):
+    def setUp(self) -> None:
+        leaderboards.clear()
+        page_cache.invalidate()
+        self.quiz = Quiz.objects.create(topic='Python')
+        self.player = self.quiz.player_set.create(name='Player1', is_achieved=True, time=timedelta(seconds=5))
+        self.leaderboard_url = reverse('quizer_game:leaderboard', args=(self.quiz.id, DIFFICULTY['easy']))
+        self.result_url = reverse('quizer_game:result',
+                                  kwargs={'player_id': self.player.id, 'quiz_id': self.quiz.id,
+                                          'selected_difficulty': DIFFICULTY['easy']})
+
+    def assertNotModified(self, url):
+        response = self.client.get(url)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.templates, [])
+
+    def test_unchanged_pages_are_not_modified(self):
+        for url in [self.leaderboard_url, self.result_url, reverse('quizer_game:leaderboard-index'),
+                    reverse('quizer_game:quiz-index')]:
+            with self.subTest(url=url):
+                self.assertNotModified(url)
+
+    def test_result_has_last_modified(self):
+        response = self.client.get(self.result_url)
+        response = self.client.get(self.result_url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_new_finisher_changes_leaderboard_etag(self):
+        etag = self.client.get(self.leaderboard_url)['ETag']
+        self.quiz.player_set.create(name='Player2', is_achieved=True, time=timedelta(seconds=3))
+        response = self.client.get(self.leaderboard_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Player2')
+
+    def test_leaderboard_etag_follows_the_board_not_the_database(self):
+        """A process whose board hasn't seen a finisher yet keeps its own ETag"""
+        etag = self.client.get(self.leaderboard_url)['ETag']
+        # a finisher saved by another process: the database changes, this board doesn't
+        counters.add_finisher(self.quiz.id)
+        self.assertEqual(self.client.get(self.leaderboard_url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        leaderboards.record(self.quiz.player_set.model(id=999, quiz=self.quiz, name='Player2', is_achieved=True,
+                                                       time=timedelta(seconds=3)))
+        self.assertEqual(self.client.get(self.leaderboard_url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_new_quiz_changes_quiz_index_etag(self):
+        url = reverse('quizer_game:quiz-index')
+        etag = self.client.get(url)['ETag']
+        Quiz.objects.create(topic='Java')
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_login_changes_etag(self):
+        etag = self.client.get(self.leaderboard_url)['ETag']
+        self.client.force_login(User.objects.create_user('player@example.com', password='secret'))
+        self.assertEqual(self.client.get(self.leaderboard_url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_turn_changes_result_etag(self):
+        etag = self.client.get(self.result_url)['ETag']
+        self.player.correct_answer = 1
+        self.player.save()
+        self.assertEqual(self.client.get(self.result_url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_renamed_quiz_changes_quiz_index_etag(self):
+        url = reverse('quizer_game:quiz-index')
+        etag = self.client.get(url)['ETag']
+        self.client.post(reverse('quizer_game:edit_data', args=(self.quiz.id,)), data={'quiz_topic': 'Java'})
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Java')
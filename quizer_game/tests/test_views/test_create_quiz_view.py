@@ -2,6 +2,21 @@ from django.test import TestCase, Client
 from django.urls import reverse
 from django.contrib.auth.models import User
 
+from quizer_game.models import Quiz, Choice
+
+
+def quiz_form_data(topic='Python') -> dict:
+    """
+    Return data of a complete create quiz form, the correct choice of every question is choice 2
+    """
+    data = {'quiz_topic': topic}
+    for i in range(1, 21):
+        data[f'question_text_{i}'] = f'Question {i}'
+        data[f'{i}_choice_value'] = 'choice2'
+        for j in range(1, 5):
+            data[f'{i}_choice_text_{j}'] = f'Choice {i}.{j}'
+    return data
+
 
 class CreateQuizTest(TestCase):
     def setUp(self):
@@ -30,3 +45,44 @@ class CreateQuizTest(TestCase):
         response = self.client.get(url)
         self.assertEqual(response.status_code, 200)
         self.assertTemplateUsed(response, 'quizer_game/login_result.html')
+
+    def test_create_quiz(self):
+        """
+        Test that a complete form creates a quiz with 20 questions and 80 choices
+        """
+        self.client.force_login(self.user)
+        url = reverse('quizer_game:update_create_quiz')
+        self.client.post(url, data=quiz_form_data())
+        quiz = Quiz.objects.get(topic='Python')
+        self.assertEqual(quiz.user_id, self.user.id)
+        self.assertEqual(quiz.question_set.count(), 20)
+        self.assertEqual(list(quiz.question_set.order_by('number').values_list('number', flat=True)),
+                         list(range(1, 21)))
+        choices = Choice.objects.filter(question__quiz=quiz)
+        self.assertEqual(choices.count(), 80)
+        self.assertEqual(choices.filter(value=1).count(), 20)
+        self.assertTrue(choices.get(text='Choice 3.2').value)
+
+    def test_create_quiz_query_count(self):
+        """
+        Test that a quiz is created with a fixed number of queries
+        """
+        self.client.force_login(self.user)
+        url = reverse('quizer_game:update_create_quiz')
+        data = quiz_form_data()
+        # session, user, savepoint, quiz, questions, question ids, choices, release
+        with self.assertNumQueries(8):
+            self.client.post(url, data=data)
+
+    def test_incomplete_quiz_is_not_created(self):
+        """
+        Test that a form with an empty choice doesn't create anything
+        """
+        self.client.force_login(self.user)
+        url = reverse('quizer_game:update_create_quiz')
+        data = quiz_form_data()
+        data['20_choice_text_4'] = ''
+        response = self.client.post(url, data=data)
+        self.assertRedirects(response, reverse('quizer_game:create-question-set'))
+        self.assertFalse(Quiz.objects.exists())
+        self.assertFalse(Choice.objects.exists())
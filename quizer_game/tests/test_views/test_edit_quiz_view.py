@@ -5,6 +5,20 @@ from django.contrib.auth.models import User
 from quizer_game.models import Quiz, Question, Choice, Player
 
 
+def edit_form_data(quiz) -> dict:
+    """
+    Return data of the edit quiz form that keeps the quiz unchanged
+    """
+    data = {'quiz_topic': quiz.topic}
+    for i, question in enumerate(quiz.question_set.order_by('number'), start=1):
+        data[f'question_text_{i}'] = question.text
+        for j, choice in enumerate(question.choice_set.order_by('id'), start=1):
+            data[f'{i}_choice_text_{j}'] = choice.text
+            if choice.value == 1:
+                data[f'{i}_choice_value'] = str(j)
+    return data
+
+
 class EditQuizTest(TestCase):
 
     def setUp(self):
@@ -27,6 +41,30 @@ class EditQuizTest(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertTemplateUsed(response, 'quizer_game/edit-question-set.html')
 
+    def test_edit_quiz_query_count(self):
+        """Test that the page is rendered with a fixed number of queries"""
+        for i in range(1, 21):
+            question = self.quiz.question_set.create(text=f'Question {i}', number=i)
+            for j in range(1, 5):
+                question.choice_set.create(text=f'Choice {i}.{j}')
+
+        self.client.force_login(self.user)
+        url = reverse('quizer_game:edit_quiz', kwargs={'quiz_id': self.quiz.id})
+        # session, user, quiz, questions, choices
+        with self.assertNumQueries(5):
+            self.client.get(url)
+
+    def test_edit_quiz_shows_questions_by_number(self):
+        """Test that questions are shown in the order of their number"""
+        self.quiz.question_set.create(text='Second', number=2)
+        self.quiz.question_set.create(text='First', number=1)
+
+        self.client.force_login(self.user)
+        url = reverse('quizer_game:edit_quiz', kwargs={'quiz_id': self.quiz.id})
+        response = self.client.get(url)
+        self.assertContains(response, 'name="question_text_1" value="First"')
+        self.assertContains(response, 'name="question_text_2" value="Second"')
+
     def test_can_view_edit_quiz_player(self):
         """Test that a player can not view edit quiz"""
 
@@ -36,4 +74,47 @@ class EditQuizTest(TestCase):
         self.assertTemplateUsed(response, 'quizer_game/login_result.html')
 
 
+class EditDataTest(TestCase):
+
+    def setUp(self):
+        self.quiz = Quiz.objects.create(topic='Hello')
+        for i in range(1, 4):
+            question = self.quiz.question_set.create(text=f'Question {i}', number=i)
+            for j in range(1, 5):
+                question.choice_set.create(text=f'Choice {i}.{j}', value=int(j == 1))
+
+        self.user = User.objects.create_user('Hello', password='world')
+        self.client.force_login(self.user)
+        self.url = reverse('quizer_game:edit_data', kwargs={'quiz_id': self.quiz.id})
+
+    def test_edit_quiz_data(self):
+        """Test that edited texts and the right choice are saved"""
+        data = edit_form_data(self.quiz)
+        data['quiz_topic'] = 'World'
+        data['question_text_2'] = 'New question 2'
+        data['3_choice_text_4'] = 'New choice 3.4'
+        data['3_choice_value'] = '4'
+        response = self.client.post(self.url, data=data)
+        self.assertRedirects(response, reverse('quizer_game:edit_quiz', kwargs={'quiz_id': self.quiz.id}))
+
+        self.quiz.refresh_from_db()
+        self.assertEqual(self.quiz.topic, 'World')
+        self.assertEqual(self.quiz.question_set.get(number=2).text, 'New question 2')
+        choices = Choice.objects.filter(question__number=3).order_by('id')
+        self.assertEqual([choice.value for choice in choices], [0, 0, 0, 1])
+        self.assertEqual(choices.last().text, 'New choice 3.4')
+
+    def test_unchanged_quiz_is_not_written(self):
+        """Test that submitting an unchanged form only reads the quiz"""
+        data = edit_form_data(self.quiz)
+        # session, user, savepoint, quiz, questions, choices, release
+        with self.assertNumQueries(7):
+            self.client.post(self.url, data=data)
 
+    def test_edit_summary_message(self):
+        """Test that the success message says what changed"""
+        data = edit_form_data(self.quiz)
+        data['1_choice_text_2'] = 'New choice 1.2'
+        response = self.client.post(self.url, data=data, follow=True)
+        message = str(list(response.context['messages'])[0])
+        self.assertEqual(message, 'Successful saving (topic unchanged, 0 question(s) and 1 choice(s) changed)')
@@ -0,0 +1,70 @@
+from django.test import TestCase
+from django.urls import reverse
+
+from quizer_game.models import Quiz, DIFFICULTY
+
+
+class GameDataTest(TestCase):
+    def setUp(self) -> None:
+        self.quiz = Quiz.objects.create(topic='Python')
+        self.question1 = self.quiz.question_set.create(text='Question 1', number=1)
+        self.correct_choice1 = self.question1.choice_set.create(text='Correct 1', value=1)
+        self.wrong_choice1 = self.question1.choice_set.create(text='Wrong 1', value=0)
+        self.question2 = self.quiz.question_set.create(text='Question 2', number=2)
+        self.correct_choice2 = self.question2.choice_set.create(text='Correct 2', value=1)
+
+    def start_game(self):
+        url = reverse('quizer_game:start-game-data', args=('Player1', ))
+        return self.client.post(url, data={'quiz_id': self.quiz.id, 'difficulty': 'easy'}).json()
+
+    def test_start_game_returns_first_question(self):
+        data = self.start_game()
+        self.assertEqual(data['status'], 'next')
+        self.assertEqual(data['question']['number'], 1)
+        self.assertEqual(data['question']['choices'],
+                         [{'id': self.correct_choice1.id, 'text': 'Correct 1'},
+                          {'id': self.wrong_choice1.id, 'text': 'Wrong 1'}])
+        self.assertTrue(data['player']['is_playing'])
+        self.assertIsNone(data['result_url'])
+
+    def test_answer_returns_next_question_and_position(self):
+        data = self.start_game()
+        response = self.client.post(data['update_url'], data={'question_number': 1,
+                                                               'choice_id': self.correct_choice1.id})
+        data = response.json()
+        self.assertEqual(data['status'], 'next')
+        self.assertEqual(data['player']['position'], 1)
+        self.assertEqual(data['player']['correct_answer'], 1)
+        self.assertEqual(data['question']['id'], self.question2.id)
+
+    def test_last_answer_returns_result_url(self):
+        data = self.start_game()
+        self.client.post(data['update_url'], data={'question_number': 1, 'choice_id': self.correct_choice1.id})
+        data = self.client.post(data['update_url'], data={'question_number': 2,
+                                                          'choice_id': self.correct_choice2.id}).json()
+        player = self.quiz.player_set.get()
+        self.assertEqual(data['status'], 'failed')
+        self.assertIsNone(data['question'])
+        self.assertEqual(data['result_url'],
+                         reverse('quizer_game:result', kwargs={'player_id': player.id, 'quiz_id': self.quiz.id,
+                                                               'selected_difficulty': DIFFICULTY['easy']}))
+
+    def test_missing_choice_is_bad_request(self):
+        data = self.start_game()
+        response = self.client.post(data['update_url'])
+        self.assertEqual(response.status_code, 400)
+
+    def test_repeated_answer_is_not_played_again(self):
+        data = self.start_game()
+        answer = {'question_number': 1, 'choice_id': self.correct_choice1.id}
+        self.client.post(data['update_url'], data=answer)
+        response = self.client.post(data['update_url'], data=answer)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.quiz.player_set.get().correct_answer, 1)
+
+    def test_choice_of_another_question_is_bad_request(self):
+        data = self.start_game()
+        response = self.client.post(data['update_url'], data={'question_number': 1,
+                                                               'choice_id': self.correct_choice2.id})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.quiz.player_set.get().correct_answer, 0)
@@ -1,6 +1,7 @@
 from django.test import TestCase, Client
 from django.urls import reverse
 
+from quizer_game import content
 from quizer_game.models import Quiz, Question, Choice, Player
 
 
@@ -30,8 +31,7 @@ class GameTest(TestCase):
         self.player = create_player(self.quiz, 'Player1')
 
         # setup player's timer
-        self.timer = self.player.timer_set.create()
-        self.timer.start()
+        self.player.start_timer()
 
     def test_can_access_by_url_name(self):
         """
@@ -50,3 +50,15 @@ class GameTest(TestCase):
                                                   'selected_difficulty': self.player.selected_difficulty})
         response = self.client.get(url)
         self.assertTemplateUsed(response, 'quizer_game/game.html')
+
+    def test_game_reads_question_from_content_cache(self):
+        """
+        Test that only the player is read from the database once the quiz content is cached
+        """
+        url = reverse('quizer_game:game', kwargs={'player_id': self.player.id, 'quiz_id': self.quiz.id,
+                                                  'selected_difficulty': self.player.selected_difficulty})
+        content.get(self.quiz.id)
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+        self.assertContains(response, 'What is str?')
+        self.assertContains(response, f'value="{self.choice2.id}">I don&#39;t know</button>')
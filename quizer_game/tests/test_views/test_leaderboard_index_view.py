@@ -1,8 +1,13 @@
 from django.test import TestCase
 from django.urls import reverse
 
+from quizer_game import page_cache
+
 
 class LeaderboardIndexTest(TestCase):
+    def setUp(self) -> None:
+        page_cache.invalidate()
+
     def test_can_access_leaderboard_index_by_url_name(self):
         """
         Test that a leaderboard index page can be access using url name
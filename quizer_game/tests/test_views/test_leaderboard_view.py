@@ -1,6 +1,8 @@
 from django.test import TestCase
+from unittest import mock
 from django.urls import reverse
 
+from quizer_game import leaderboards
 from quizer_game.models import Quiz, Question, Choice, Player
 from datetime import timedelta
 
@@ -17,6 +19,8 @@ class LeaderboardTest(TestCase):
         """
         Setup quiz and players for testing
         """
+        leaderboards.clear()
+
         # setup quiz
         self.quiz = Quiz.objects.create(topic='Python')
         self.question = Question.objects.create(quiz=self.quiz, text='What is str?', number=1)
@@ -59,8 +63,8 @@ class LeaderboardTest(TestCase):
                       kwargs={'quiz_id': self.quiz.id,
                               'selected_difficulty': 0})
         response = self.client.get(url)
-        player_list = list(response.context['players'])
-        self.assertQuerysetEqual(player_list, ['<Player: Player1>', '<Player: Player3>'])
+        player_list = [player.name for player in response.context['players']]
+        self.assertEqual(player_list, ['Player1', 'Player3'])
 
     def test_leaderboard_displays_players_who_play_the_same_difficulty(self) -> None:
         """
@@ -79,5 +83,61 @@ class LeaderboardTest(TestCase):
                       kwargs={'quiz_id': self.quiz.id,
                               'selected_difficulty': 1})
         response = self.client.get(url)
-        player_list = list(response.context['players'])
-        self.assertQuerysetEqual(player_list, ['<Player: Player2>', '<Player: Player3>'])
+        player_list = [player.name for player in response.context['players']]
+        self.assertEqual(player_list, ['Player2', 'Player3'])
+
+    def test_leaderboard_displays_new_achieved_player(self) -> None:
+        """
+        A player who reaches the finish line after the leaderboard is loaded is added to it
+        """
+        url = reverse('quizer_game:leaderboard',
+                      kwargs={'quiz_id': self.quiz.id,
+                              'selected_difficulty': 0})
+        self.client.get(url)
+        create_achieved_player(self.quiz, 'Player4', time=timedelta(seconds=550))
+
+        response = self.client.get(url)
+        player_list = [player.name for player in response.context['players']]
+        self.assertEqual(player_list, ['Player1', 'Player4', 'Player2', 'Player3'])
+
+    def test_leaderboard_is_paginated_by_cursor(self) -> None:
+        """
+        Leaderboard shows one page of players and a cursor to the next page
+        """
+        url = reverse('quizer_game:leaderboard',
+                      kwargs={'quiz_id': self.quiz.id,
+                              'selected_difficulty': 0})
+        with mock.patch('quizer_game.views.LEADERBOARD_PAGE_SIZE', 2):
+            response = self.client.get(url)
+            self.assertEqual([player.name for player in response.context['players']],
+                             ['Player1', 'Player2'])
+            next_cursor = response.context['next_cursor']
+
+            response = self.client.get(url, {'after': next_cursor})
+        self.assertEqual([player.name for player in response.context['players']], ['Player3'])
+        self.assertEqual(response.context['rank_offset'], 2)
+        self.assertIsNone(response.context['next_cursor'])
+
+    def test_leaderboard_rejects_invalid_cursor(self) -> None:
+        url = reverse('quizer_game:leaderboard',
+                      kwargs={'quiz_id': self.quiz.id,
+                              'selected_difficulty': 0})
+        response = self.client.get(url, {'after': 'abc'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_leaderboard_data_returns_json_page(self) -> None:
+        """
+        Leaderboard data returns players of a page with their rank and the next cursor
+        """
+        url = reverse('quizer_game:leaderboard-data',
+                      kwargs={'quiz_id': self.quiz.id,
+                              'selected_difficulty': 0})
+        with mock.patch('quizer_game.views.LEADERBOARD_PAGE_SIZE', 2):
+            data = self.client.get(url).json()
+            self.assertEqual([row['name'] for row in data['players']], ['Player1', 'Player2'])
+            self.assertEqual(data['players'][0], {'rank': 1, 'name': 'Player1',
+                                                  'time': 500.0, 'total_answer': 0})
+
+            data = self.client.get(url, {'after': data['next']}).json()
+        self.assertEqual(data['players'][0]['rank'], 3)
+        self.assertIsNone(data['next'])
@@ -0,0 +1,85 @@
+import json
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from quizer_game import content
+from quizer_game.models import Quiz
+
+
+class QuestionPackTest(TestCase):
+    def setUp(self) -> None:
+        content.clear()
+        self.quiz = Quiz.objects.create(topic='Python')
+        self.question1 = self.quiz.question_set.create(text='Question 1', number=1)
+        self.correct_choice1 = self.question1.choice_set.create(text='Correct 1', value=1)
+        self.wrong_choice1 = self.question1.choice_set.create(text='Wrong 1', value=0)
+        self.url = reverse('quizer_game:question-pack', args=(self.quiz.id, ))
+
+    def test_pack_has_questions_without_answers(self):
+        data = self.client.get(self.url).json()
+        self.assertEqual(data['topic'], 'Python')
+        self.assertEqual(data['questions'], [{'id': self.question1.id, 'number': 1, 'text': 'Question 1',
+                                              'choices': [[self.correct_choice1.id, 'Correct 1'],
+                                                          [self.wrong_choice1.id, 'Wrong 1']]}])
+
+    @override_settings(QUESTION_PACK_MAX_AGE=600)
+    def test_pack_is_cacheable(self):
+        response = self.client.get(self.url)
+        self.assertIn('max-age=600', response['Cache-Control'])
+        self.assertIn('public', response['Cache-Control'])
+        self.assertTrue(response.has_header('ETag'))
+
+    def test_unchanged_pack_is_not_modified(self):
+        response = self.client.get(self.url)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_edit_changes_etag(self):
+        old_etag = self.client.get(self.url)['ETag']
+        self.question1.text = 'Question one'
+        self.question1.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=old_etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_unknown_quiz(self):
+        response = self.client.get(reverse('quizer_game:question-pack', args=(self.quiz.id + 1, )))
+        self.assertEqual(response.status_code, 404)
+
+
+class CheckAnswersTest(TestCase):
+    def setUp(self) -> None:
+        content.clear()
+        self.quiz = Quiz.objects.create(topic='Python')
+        self.question1 = self.quiz.question_set.create(text='Question 1', number=1)
+        self.correct_choice1 = self.question1.choice_set.create(text='Correct 1', value=1)
+        self.wrong_choice1 = self.question1.choice_set.create(text='Wrong 1', value=0)
+        self.question2 = self.quiz.question_set.create(text='Question 2', number=2)
+        self.correct_choice2 = self.question2.choice_set.create(text='Correct 2', value=1)
+        self.question3 = self.quiz.question_set.create(text='Question 3', number=3)
+        self.player = self.quiz.player_set.create(name='Player1', is_playing=True, current_question=self.question1)
+        self.player.start_timer()
+        self.url = reverse('quizer_game:check-answers', args=(self.player.id, self.quiz.id, 0))
+
+    def check(self, *answers):
+        body = {'answers': [{'question_number': number, 'choice_id': choice_id} for number, choice_id in answers]}
+        return self.client.post(self.url, data=json.dumps(body), content_type='application/json')
+
+    def test_checked_answers_are_played(self):
+        data = self.check((1, self.wrong_choice1.id), (2, self.correct_choice2.id)).json()
+        self.assertEqual(data['results'], [{'question_number': 1, 'choice_id': self.wrong_choice1.id, 'correct': False},
+                                           {'question_number': 2, 'choice_id': self.correct_choice2.id, 'correct': True}])
+        self.assertEqual(data['question']['number'], 3)
+        self.player.refresh_from_db()
+        self.assertEqual((self.player.wrong_answer, self.player.correct_answer), (1, 1))
+
+    def test_answer_cant_be_checked_twice(self):
+        """Checking every choice of a question is not possible: the first check is the answer"""
+        self.check((1, self.wrong_choice1.id))
+        response = self.check((1, self.correct_choice1.id))
+        self.assertEqual(response.status_code, 400)
+        self.player.refresh_from_db()
+        self.assertEqual(self.player.correct_answer, 0)
+
+    def test_choice_of_another_question_is_bad_request(self):
+        response = self.check((1, self.correct_choice2.id))
+        self.assertEqual(response.status_code, 400)
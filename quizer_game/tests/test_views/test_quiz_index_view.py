@@ -1,6 +1,7 @@
 from django.test import TestCase
 from django.urls import reverse
 
+from quizer_game import page_cache
 from quizer_game.models import Quiz
 
 
@@ -11,6 +12,9 @@ class QuizIndexTest(TestCase):
         Quiz.objects.create(topic='Quiz 2')
         Quiz.objects.create(topic='Quiz 3')
 
+    def setUp(self) -> None:
+        page_cache.invalidate()
+
     def test_can_access_quiz_index_by_url_name(self) -> None:
         """
         Test that a quiz-index page can be accessed by url name
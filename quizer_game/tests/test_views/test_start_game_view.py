@@ -1,7 +1,7 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.urls import reverse
 
-from quizer_game.models import Quiz, Question, Choice
+from quizer_game.models import Quiz, Question, Choice, HARD_LVL_TIME_LIMIT
 
 
 class StartGameTest(TestCase):
@@ -48,3 +48,18 @@ class StartGameTest(TestCase):
                                     'difficulty': 'easy'})
         total_player_new = len(self.quiz.player_set.all())
         self.assertEqual(total_player_new, total_player_old + 1)
+
+    def test_hard_game_expires_at_time_limit(self):
+        url = reverse('quizer_game:start-game', args=('Player1', ))
+        self.client.post(url, data={'quiz_id': self.quiz.id,
+                                    'difficulty': 'hard'})
+        player = self.quiz.player_set.get()
+        self.assertEqual(player.expires_at, player.start_point + HARD_LVL_TIME_LIMIT * 1000)
+
+    @override_settings(GAME_IDLE_TIMEOUT=600)
+    def test_easy_game_expires_after_idle_timeout(self):
+        url = reverse('quizer_game:start-game', args=('Player1', ))
+        self.client.post(url, data={'quiz_id': self.quiz.id,
+                                    'difficulty': 'easy'})
+        player = self.quiz.player_set.get()
+        self.assertGreaterEqual(player.expires_at, player.start_point + 600 * 1000)
@@ -0,0 +1,94 @@
+import json
+from django.test import TestCase
+from django.urls import reverse
+
+from quizer_game.models import Quiz, DIFFICULTY
+from datetime import timedelta
+
+
+class UpdateGameBatchTest(TestCase):
+    def setUp(self) -> None:
+        self.quiz = Quiz.objects.create(topic='Python')
+        self.questions = []
+        for number in range(1, 4):
+            question = self.quiz.question_set.create(text=f'Question {number}', number=number)
+            question.correct = question.choice_set.create(text=f'Correct {number}', value=1)
+            question.wrong = question.choice_set.create(text=f'Wrong {number}', value=0)
+            self.questions.append(question)
+
+        self.player = self.quiz.player_set.create(name='Player1', is_playing=True,
+                                                  current_question=self.questions[0])
+        self.player.start_timer()
+
+    def post_batch(self, answers, player=None):
+        player = player or self.player
+        url = reverse('quizer_game:update-batch',
+                      kwargs={'player_id': player.id, 'quiz_id': self.quiz.id,
+                              'selected_difficulty': player.selected_difficulty})
+        return self.client.post(url, data=json.dumps({'answers': answers}), content_type='application/json')
+
+    def answer(self, question, choice, delay=1000):
+        return {'question_number': question.number, 'choice_id': choice.id,
+                'client_timestamp': self.player.start_point + delay * question.number}
+
+    def test_play_answers_in_one_request(self):
+        response = self.post_batch([self.answer(self.questions[0], self.questions[0].correct),
+                                    self.answer(self.questions[1], self.questions[1].wrong)])
+        data = response.json()
+        self.assertEqual(data['status'], 'next')
+        self.assertEqual(data['played'], 2)
+        self.assertEqual(data['question']['number'], 3)
+        self.player.refresh_from_db()
+        self.assertEqual(self.player.position, 1)
+        self.assertEqual(self.player.correct_answer, 1)
+        self.assertEqual(self.player.wrong_answer, 1)
+        self.assertEqual(self.player.current_question, self.questions[2])
+
+    def test_last_answer_finishes_game(self):
+        answers = [self.answer(question, question.correct) for question in self.questions]
+        data = self.post_batch(answers).json()
+        self.assertEqual(data['status'], 'failed')
+        self.player.refresh_from_db()
+        self.assertFalse(self.player.is_playing)
+        self.assertTrue(self.player.is_failed)
+
+    def test_out_of_order_batch_saves_nothing(self):
+        response = self.post_batch([self.answer(self.questions[0], self.questions[0].correct),
+                                    self.answer(self.questions[2], self.questions[2].correct)])
+        self.assertEqual(response.status_code, 400)
+        self.player.refresh_from_db()
+        self.assertEqual(self.player.position, 0)
+        self.assertEqual(self.player.current_question, self.questions[0])
+
+    def test_choice_of_another_question_is_bad_request(self):
+        response = self.post_batch([self.answer(self.questions[0], self.questions[1].correct)])
+        self.assertEqual(response.status_code, 400)
+
+    def test_client_timestamp_does_not_shorten_time(self):
+        self.player.start_point -= 5000
+        self.player.start_monotonic -= 5000
+        self.player.save()
+        answers = [dict(self.answer(question, question.correct), client_timestamp=timestamp)
+                   for question, timestamp in zip(self.questions, [0, self.player.start_point, 0])]
+        self.post_batch(answers)
+        self.player.refresh_from_db()
+        self.assertFalse(self.player.is_playing)
+        self.assertGreaterEqual(self.player.time, timedelta(seconds=5))
+
+    def test_hard_game_is_timed_by_server(self):
+        player = self.quiz.player_set.create(name='Player2', is_playing=True, current_question=self.questions[0],
+                                             selected_difficulty=DIFFICULTY['hard'],
+                                             time_limit=timedelta(seconds=60))
+        player.start_timer()
+        player.start_point -= 61_000
+        player.start_monotonic -= 61_000
+        player.save()
+        data = self.post_batch([self.answer(self.questions[0], self.questions[0].correct, delay=1)],
+                               player=player).json()
+        self.assertEqual(data['status'], 'timeout')
+
+    def test_finished_game_is_bad_request(self):
+        self.player.is_playing = False
+        self.player.save()
+        response = self.post_batch([self.answer(self.questions[0], self.questions[0].correct)])
+        self.assertEqual(response.status_code, 400)
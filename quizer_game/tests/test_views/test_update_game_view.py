@@ -1,8 +1,8 @@
 from django.test import TestCase
 from django.urls import reverse
 
+from quizer_game import content
 from quizer_game.models import Quiz
-from datetime import timedelta
 
 
 class UpdateGameTest(TestCase):
@@ -16,10 +16,9 @@ class UpdateGameTest(TestCase):
         self.player = self.quiz.player_set.create(name='Player1')
         self.player.current_question = self.question1
         self.player.position = 0
+        self.player.is_playing = True
         self.player.save()
-
-        self.timer = self.player.timer_set.create()
-        self.timer.start()
+        self.player.start_timer()
 
     def test_can_access_by_url_name(self) -> None:
         """
@@ -62,12 +61,10 @@ class UpdateGameTest(TestCase):
         Test that update_game redirects to result view when the time is up (only in hard level)
         """
         self.player.selected_difficulty = 2
+        self.player.start_point = 0
+        self.player.end_point = 63000
         self.player.save()
 
-        self.timer.start_point = timedelta(seconds=0)
-        self.timer.end_point = timedelta(seconds=63)
-        self.timer.save()
-
         url = reverse('quizer_game:update',
                       kwargs={'player_id': self.player.id,
                               'quiz_id': self.quiz.id,
@@ -90,12 +87,10 @@ class UpdateGameTest(TestCase):
         Test that update_game update player statuses when the time is up (only in hard level)
         """
         self.player.selected_difficulty = 2
+        self.player.start_point = 0
+        self.player.end_point = 63000
         self.player.save()
 
-        self.timer.start_point = timedelta(seconds=0)
-        self.timer.end_point = timedelta(seconds=63)
-        self.timer.save()
-
         url = reverse('quizer_game:update',
                       kwargs={'player_id': self.player.id,
                               'quiz_id': self.quiz.id,
@@ -152,6 +147,8 @@ class UpdateGameTest(TestCase):
         self.player.refresh_from_db()
         self.assertTrue(self.player.is_achieved)
         self.assertFalse(self.player.is_playing)
+        self.quiz.refresh_from_db()
+        self.assertEqual(self.quiz.total_player, 1)
 
     def test_redirect_to_result_view_when_player_answers_all_questions(self) -> None:
         """
@@ -287,3 +284,78 @@ class UpdateGameTest(TestCase):
 
         self.assertEqual(self.player.position, old_pos - 1)
 
+    def test_player_moves_to_next_question(self):
+        """
+        When the player doesn't win yet, the current question will change to the next question
+        """
+        question2 = self.quiz.question_set.create(text='Question 2', number=2)
+        url = reverse('quizer_game:update',
+                      kwargs={'player_id': self.player.id,
+                              'quiz_id': self.quiz.id,
+                              'selected_difficulty': self.player.selected_difficulty
+                              }
+                      )
+
+        self.client.post(url, data={'choice_id': self.correct_choice1.id})
+        self.player.refresh_from_db()
+        self.assertEqual(self.player.current_question, question2)
+
+    def test_update_game_query_count(self):
+        """
+        A turn is loaded with one query and saved in one transaction
+        """
+        self.quiz.question_set.create(text='Question 2', number=2)
+        content.get(self.quiz.id)
+        url = reverse('quizer_game:update',
+                      kwargs={'player_id': self.player.id,
+                              'quiz_id': self.quiz.id,
+                              'selected_difficulty': self.player.selected_difficulty
+                              }
+                      )
+
+        # select, savepoint, update player, release savepoint
+        with self.assertNumQueries(4):
+            self.client.post(url, data={'choice_id': self.correct_choice1.id})
+
+    def test_unknown_choice_returns_404(self):
+        url = reverse('quizer_game:update',
+                      kwargs={'player_id': self.player.id,
+                              'quiz_id': self.quiz.id,
+                              'selected_difficulty': self.player.selected_difficulty
+                              }
+                      )
+
+        response = self.client.post(url, data={'choice_id': 999})
+        self.assertEqual(response.status_code, 404)
+
+    def test_answer_after_the_game_ended_is_not_played(self):
+        """
+        Posting an answer again after reaching the finish line shows the result
+        and doesn't count the finisher or the time again
+        """
+        self.player.position = 15
+        self.player.save()
+        url = reverse('quizer_game:update',
+                      kwargs={'player_id': self.player.id,
+                              'quiz_id': self.quiz.id,
+                              'selected_difficulty': self.player.selected_difficulty
+                              }
+                      )
+        url_redirect = reverse('quizer_game:result',
+                               kwargs={'player_id': self.player.id,
+                                       'quiz_id': self.quiz.id,
+                                       'selected_difficulty': self.player.selected_difficulty
+                                       }
+                               )
+
+        self.client.post(url, data={'choice_id': self.correct_choice1.id})
+        self.player.refresh_from_db()
+        finished_time = self.player.time
+        for _ in range(2):
+            response = self.client.post(url, data={'choice_id': self.correct_choice1.id})
+            self.assertRedirects(response, url_redirect)
+        self.player.refresh_from_db()
+        self.assertEqual(self.player.time, finished_time)
+        self.assertEqual(self.player.correct_answer, 1)
+        self.quiz.refresh_from_db()
+        self.assertEqual(self.quiz.finisher_count, 1)
@@ -102,3 +102,32 @@ class UpvoteDownvoteTest(TestCase):
         self.client.get(url)
         self.player.refresh_from_db()
         self.assertFalse(self.player.has_vote)
+
+    def test_second_vote_is_ignored(self):
+        url = reverse('quizer_game:upvote-downvote',
+                      kwargs={'player_id': self.player.id,
+                              'quiz_id': self.quiz.id,
+                              'selected_difficulty': self.player.selected_difficulty,
+                              'code': self.upvote_code
+                              }
+                      )
+        self.client.get(url)
+        self.client.get(url)
+        self.quiz.refresh_from_db()
+        self.assertEqual(self.quiz.upvotes, 1)
+
+    def test_vote_does_not_overwrite_topic(self):
+        """
+        A vote only updates the vote counter of the quiz
+        """
+        Quiz.objects.filter(pk=self.quiz.id).update(topic='Python 3')
+        url = reverse('quizer_game:upvote-downvote',
+                      kwargs={'player_id': self.player.id,
+                              'quiz_id': self.quiz.id,
+                              'selected_difficulty': self.player.selected_difficulty,
+                              'code': self.upvote_code
+                              }
+                      )
+        self.client.get(url)
+        self.quiz.refresh_from_db()
+        self.assertEqual(self.quiz.topic, 'Python 3')
@@ -2,6 +2,8 @@ from django.test import TestCase, Client
 from django.urls import reverse
 from django.contrib.auth.models import User
 
+from quizer_game.models import Quiz
+
 
 class UserProfileTest(TestCase):
     def setUp(self):
@@ -30,3 +32,18 @@ class UserProfileTest(TestCase):
         response = self.client.get(url)
         self.assertEqual(response.status_code, 200)
         self.assertTemplateUsed(response, 'quizer_game/login_result.html')
+
+    def test_user_profile_query_count_does_not_grow_with_players(self):
+        """
+        Number of players of each quiz doesn't load players
+        """
+        for i in range(3):
+            quiz = Quiz.objects.create(topic=f'Quiz {i}', user_id=self.user.id)
+            for j in range(5):
+                quiz.player_set.create(name=f'Player {j}', is_achieved=True)
+        self.client.force_login(self.user)
+        url = reverse('quizer_game:user_profile')
+
+        # session, user and quizzes
+        with self.assertNumQueries(3):
+            self.client.get(url)
@@ -13,20 +13,34 @@ urlpatterns = [
          views.quiz_level, name='quiz-level'),
     path('start-game/<str:player_name>/',
          views.start_game, name='start-game'),
+    path('start-game/<str:player_name>/data/',
+         views.start_game_data, name='start-game-data'),
     path('game/<int:player_id>/<int:quiz_id>/<int:selected_difficulty>/',
          views.game, name='game'),
     path('game/<int:player_id>/<int:quiz_id>/<int:selected_difficulty>/update/',
          views.update_game, name='update'),
+    path('game/<int:player_id>/<int:quiz_id>/<int:selected_difficulty>/update/data/',
+         views.update_game_data, name='update-data'),
+    path('game/<int:player_id>/<int:quiz_id>/<int:selected_difficulty>/update/batch/',
+         views.update_game_batch, name='update-batch'),
+    path('game/<int:player_id>/<int:quiz_id>/<int:selected_difficulty>/check-answers/',
+         views.check_answers, name='check-answers'),
     path('game/<int:player_id>/<int:quiz_id>/<int:selected_difficulty>/result/',
          views.result, name='result'),
     path('game/<int:player_id>/<int:quiz_id>/<int:selected_difficulty>/quit/',
          views.quit_game, name='quit-game'),
     path('game/<int:player_id>/<int:quiz_id>/<int:selected_difficulty>/<int:code>/upvote-downvote/',
          views.upvote_downvote, name='upvote-downvote'),
+    path('quiz/<int:quiz_id>/pack/',
+         views.question_pack_data, name='question-pack'),
     path('leaderboard-index/',
          views.leaderboard_index, name='leaderboard-index'),
     path('leaderboard/<int:quiz_id>/<int:selected_difficulty>/',
          views.leaderboard, name='leaderboard'),
+    path('leaderboard/<int:quiz_id>/<int:selected_difficulty>/data/',
+         views.leaderboard_data, name='leaderboard-data'),
+    path('leaderboard/<int:quiz_id>/<int:selected_difficulty>/live/',
+         views.leaderboard_live, name='leaderboard-live'),
     path('login/',
          views.login, name='login'),
     path('create-quiz/',
@@ -45,4 +59,5 @@ urlpatterns = [
          views.update_user_profile, name='update-user-profile'),
     path('logout/', views.logout_user, name='logout'),
     path('login-result/', views.login_result, name='login_result'),
+    path('metrics/', views.request_metrics, name='request-metrics'),
 ]
@@ -1,33 +1,38 @@
 from django.shortcuts import render, get_object_or_404, redirect
+from django.http import HttpResponse, JsonResponse, HttpResponseBadRequest, StreamingHttpResponse
+from django.conf import settings
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition, etag
 from django.urls import reverse
-from django.core.exceptions import ObjectDoesNotExist
+from django.db import transaction
 from django.contrib import messages
+from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth import logout
 from django.contrib.auth.signals import user_logged_in, user_logged_out, user_login_failed
 from django.dispatch import receiver
 
 
-from .models import Quiz, Choice, Timer
-
-from datetime import timedelta
-import time
+from .models import Quiz, Question, Choice, Player
+from .models import DIFFICULTY, DIFFICULTY_NUM, CHOICE_VALUE, POSITION, HARD_LVL_TIME_LIMIT
+from .models import PLAYERS_FOR_TESTING
+from .models import quiz_tree_prefetch
+from . import clock, content, counters, engine, game_state, leaderboards, live, metrics, page_cache
+from .routers import replica_reads
+from .forms import read_quiz_data
 
+import hashlib
+import json
 import logging
 
 logger = logging.getLogger(__name__)
 
 # Create your views here.
-DIFFICULTY = {'easy': 0, 'medium': 1, 'hard': 2}
-DIFFICULTY_NUM = {0: 'Easy', 1: 'Medium', 2: 'Hard'}
-CHOICE_VALUE = {'wrong': 0, 'correct': 1}
-POSITION = {'max': 15, 'min': 0}
-HARD_LVL_TIME_LIMIT = 60            # seconds
-PLAYERS_FOR_TESTING = ['player_test_5_q', 'player_test_20_q']
+LEADERBOARD_PAGE_SIZE = 50
+QUESTION_PACK_MAX_AGE = 86400   # seconds, default for settings.QUESTION_PACK_MAX_AGE
 
 
 def create_player(quiz, player_name, selected_difficulty):
     player = quiz.player_set.create(name=player_name)
-    player.timer_set.create()
     player.current_question = quiz.question_set.get(number=1)
     player.selected_difficulty = selected_difficulty
     player.is_playing = True
@@ -37,21 +42,19 @@ def create_player(quiz, player_name, selected_difficulty):
 
 def setup_timer(player):
     # setup default values to timer
-    timer = Timer.objects.get(player=player)
     if player.selected_difficulty == DIFFICULTY['hard']:
-        timer.set_time_limit(seconds=HARD_LVL_TIME_LIMIT)
+        player.set_time_limit(seconds=HARD_LVL_TIME_LIMIT, commit=False)
 
     # for testing
-    timer.start_point = timedelta(seconds=int(time.time()))
-    timer.end_point = timedelta(seconds=int(time.time()))
-
-    timer.save()
-    return timer
+    player.start_point = clock.now_ms()
+    player.end_point = player.start_point
 
 
 def setup_player_for_testing(quiz, player_name, selected_difficulty, position):
     # setup default values to player
     player = quiz.player_set.get(name=player_name)
+    if player.is_achieved:
+        counters.remove_finisher(quiz.id)
     player.current_question = quiz.question_set.get(number=1)
     player.position = position
     player.selected_difficulty = selected_difficulty
@@ -61,12 +64,10 @@ def setup_player_for_testing(quiz, player_name, selected_difficulty, position):
     player.is_failed = False
     player.is_achieved = False
     player.is_timeout = False
-    player.save()
     # setup default values to timer
-    timer = Timer.objects.get(player=player)
-    timer.start_point = timedelta(seconds=int(time.time()))
-    timer.end_point = timedelta(seconds=int(time.time()))
-    timer.save()
+    player.start_point = clock.now_ms()
+    player.end_point = player.start_point
+    player.save()
     return player
 
 
@@ -106,10 +107,12 @@ def user_logout_callback(sender, request, user, **kwargs):
     logger.info(f"{user_ip} {user.username} logged out")
 
 
+@page_cache.cached_page
 def index(request):
     return render(request, 'quizer_game/index.html')
 
 
+@page_cache.cached_page
 def login(request):
     return render(request, 'quizer_game/login.html')
 
@@ -123,6 +126,13 @@ def player_name(request):
     return render(request, 'quizer_game/player-name.html')
 
 
+def nav_user(request) -> str:
+    """Username shown in the nav bar, part of the ETag of pages with a nav bar"""
+    return request.user.get_username() if request.user.is_authenticated else ''
+
+
+@replica_reads
+@page_cache.cached_page
 def leaderboard_index(request):
     quiz = Quiz.objects.all()
     context = {'quizzes': quiz}
@@ -130,13 +140,16 @@ def leaderboard_index(request):
 
 
 # <str:player_name>/quiz-level/
+@replica_reads
 def quiz_level(request):
     input_player_name = request.POST['player_name']
     if input_player_name == '':
         messages.error(request, "Please enter player's name!")
         return redirect(reverse('quizer_game:player-name'))
-    quizzes = Quiz.objects.all()
-    top_quizzes = Quiz.objects.order_by('-upvotes')[:5]
+    # the page has a form, so only its quiz lists are cached
+    quizzes = page_cache.cached_value('quizzes', lambda: list(Quiz.objects.only('topic')))
+    top_quizzes = page_cache.cached_value('top_quizzes',
+                                          lambda: list(Quiz.objects.only('topic', 'upvotes').order_by('-upvotes')[:5]))
     context = {'player_name': input_player_name,
                'quizzes': quizzes,
                'top_quizzes': top_quizzes}
@@ -144,7 +157,8 @@ def quiz_level(request):
 
 
 # /quizer/start-game/player_name/quiz_id/difficulty/
-def start_game(request, player_name):
+def begin_game(request, player_name):
+    """Create or reset the player of a new game and start its timer"""
     quiz_id = request.POST['quiz_id']
     difficulty = request.POST['difficulty']
     quiz = get_object_or_404(Quiz, pk=quiz_id)
@@ -154,22 +168,65 @@ def start_game(request, player_name):
     else:
         player = create_player(quiz, player_name, DIFFICULTY[difficulty])
 
-    timer = setup_timer(player)
-    timer.start()
+    setup_timer(player)
+    player.start_timer(commit=False)
+    player.refresh_expiry()
+    player.save()
+    if game_state.enabled():
+        game_state.save(player)
+    return player
+
+
+def start_game(request, player_name):
+    player = begin_game(request, player_name)
     return redirect(reverse('quizer_game:game',
-                            kwargs={'player_id': player.id, 'quiz_id': quiz.id,
+                            kwargs={'player_id': player.id, 'quiz_id': player.quiz_id,
                                     'selected_difficulty': player.selected_difficulty, }
                             )
                     )
 
 
+def game_data(player, outcome):
+    """JSON state of a game after `outcome`, with the next question while the game goes on"""
+    kwargs = {'player_id': player.id, 'quiz_id': player.quiz_id,
+              'selected_difficulty': player.selected_difficulty, }
+    data = {'status': outcome,
+            'player': {'id': player.id,
+                       'position': player.position,
+                       'correct_answer': player.correct_answer,
+                       'wrong_answer': player.wrong_answer,
+                       'is_playing': player.is_playing,
+                       },
+            'question': None,
+            'update_url': reverse('quizer_game:update-data', kwargs=kwargs),
+            'result_url': None,
+            }
+    if outcome == engine.NEXT_QUESTION:
+        question = content.get(player.quiz_id).question(player.current_question_id)
+        data['question'] = {'id': question.id,
+                            'number': question.number,
+                            'text': question.text,
+                            'choices': [{'id': choice.id, 'text': choice.text} for choice in question.choices],
+                            }
+    else:
+        data['result_url'] = reverse('quizer_game:result', kwargs=kwargs)
+    return data
+
+
+# /quizer/start-game/player_name/data/
+def start_game_data(request, player_name):
+    player = begin_game(request, player_name)
+    return JsonResponse(game_data(player, engine.NEXT_QUESTION))
+
+
 # /quizer/game/player_id/quiz_id/difficulty/
 # TODO handle error (link to 404 not found page)
 def game(request, player_id, quiz_id, selected_difficulty):
-    quiz = get_object_or_404(Quiz, pk=quiz_id)
-    player = quiz.player_set.get(pk=player_id)
-    question = player.current_question
-    # timer = Timer.objects.get(player=player)
+    player = game_state.load(quiz_id, player_id)
+    if player is None:
+        player = get_object_or_404(Player, pk=player_id, quiz_id=quiz_id)
+    quiz = content.get(quiz_id)
+    question = quiz.question(player.current_question_id)
     context = {'quiz': quiz,
                'player': player,
                'question': question,
@@ -181,107 +238,156 @@ def game(request, player_id, quiz_id, selected_difficulty):
 # TODO handle error (link to 404 not found page)
 # /quizer/game/player_id/quiz_id/difficulty/update/
 def update_game(request, player_id, quiz_id, selected_difficulty):
-    quiz = get_object_or_404(Quiz, pk=quiz_id)
-    player = quiz.player_set.get(pk=player_id)
-    choice_id = request.POST['choice_id']
-    choice = Choice.objects.get(pk=choice_id)
-    timer = Timer.objects.get(player=player)
-    timer.stop()
-
-    # check time for hard level
-    if player.selected_difficulty == DIFFICULTY['hard']:
-        if timer.time_duration >= timer.time_limit:
-            player.is_timeout = True
-            player.is_playing = False
-            player.save()
-            player.save_time_duration()
-            return redirect(reverse('quizer_game:result',
-                                    kwargs={'player_id': player.id, 'quiz_id': quiz.id,
-                                            'selected_difficulty': player.selected_difficulty, }
-                                    )
-                            )
-
-    # update position
-    update_player_position(choice, player, selected_difficulty)
-
-    # check if player reaches the finish line or not
-    if player.position == POSITION['max']:
-        player.is_playing = False
-        player.is_achieved = True
-        player.save()
-        player.save_time_duration()
+    try:
+        turn = engine.load_turn(quiz_id, player_id, request.POST['choice_id'])
+        outcome = engine.play_turn(turn)
+    except engine.GameOver:
+        # an answer posted again after the game ended only shows the result
         return redirect(reverse('quizer_game:result',
-                                kwargs={'player_id': player.id, 'quiz_id': quiz.id,
-                                        'selected_difficulty': player.selected_difficulty, }
+                                kwargs={'player_id': player_id, 'quiz_id': quiz_id,
+                                        'selected_difficulty': selected_difficulty, }
                                 )
                         )
-    elif player.position < POSITION['max']:
-        # change to next question
-        try:
-            old_question = player.current_question
-            new_question_number = old_question.number + 1
-            player.current_question = quiz.question_set.get(number=new_question_number)
-        except ObjectDoesNotExist:
-            player.is_playing = False
-            player.is_failed = True
-            player.save()
-            player.save_time_duration()
-            return redirect(reverse('quizer_game:result',
-                                    kwargs={'player_id': player.id, 'quiz_id': quiz.id,
-                                            'selected_difficulty': player.selected_difficulty, }
-                                    )
-                            )
-
-    player.save()
-    return redirect(reverse('quizer_game:game',
-                            kwargs={'player_id': player.id, 'quiz_id': quiz.id,
-                                    'selected_difficulty': player.selected_difficulty}
+    player = turn.player
+    view_name = 'quizer_game:game' if outcome == engine.NEXT_QUESTION else 'quizer_game:result'
+    return redirect(reverse(view_name,
+                            kwargs={'player_id': player.id, 'quiz_id': quiz_id,
+                                    'selected_difficulty': player.selected_difficulty, }
                             )
                     )
 
 
-def update_player_position(choice, player, difficulty) -> None:
-    if choice.value == CHOICE_VALUE['correct']:
-        player.correct_answer += 1
-        if player.position < POSITION['max']:
-            player.move_forward()
-    else:
-        player.wrong_answer += 1
-        if player.selected_difficulty > DIFFICULTY['easy']:
-            if player.position > POSITION['min']:
-                player.move_backward()
+# /quizer/game/player_id/quiz_id/difficulty/update/data/
+def update_game_data(request, player_id, quiz_id, selected_difficulty):
+    """
+    Play the answer (choice_id) to the current question (question_number) and
+    return the new state of the game with the next question, an answer to
+    another question is rejected so a repeated request can't play twice
+    """
+    answer = {'question_number': request.POST.get('question_number'), 'choice_id': request.POST.get('choice_id')}
+    if None in answer.values():
+        return HttpResponseBadRequest('Missing question_number or choice_id')
+    try:
+        player, outcome, played = engine.play_batch(quiz_id, player_id, [answer])
+    except ValueError as error:
+        return HttpResponseBadRequest(str(error))
+    return JsonResponse(game_data(player, outcome))
+
+
+def question_pack(quiz) -> dict:
+    """Questions and choices of a quiz content without the values of the choices"""
+    return {'id': quiz.id,
+            'topic': quiz.topic,
+            'questions': [{'id': question.id,
+                           'number': question.number,
+                           'text': question.text,
+                           'choices': [[choice.id, choice.text] for choice in question.choices],
+                           }
+                          for question in quiz.questions],
+            }
+
+
+def question_pack_etag(request, quiz_id):
+    pack = json.dumps(question_pack(content.get(quiz_id)), sort_keys=True)
+    return hashlib.md5(pack.encode()).hexdigest()
+
+
+# /quizer/quiz/quiz_id/pack/
+@etag(question_pack_etag)
+def question_pack_data(request, quiz_id):
+    """All questions of a quiz in one cacheable response, answers are played with update_game_batch"""
+    response = JsonResponse(question_pack(content.get(quiz_id)))
+    patch_cache_control(response, public=True,
+                        max_age=getattr(settings, 'QUESTION_PACK_MAX_AGE', QUESTION_PACK_MAX_AGE))
+    return response
+
+
+def play_answers(request, quiz_id, player_id):
+    """
+    Play the JSON batch of answers {"answers": [{"question_number", "choice_id",
+    "client_timestamp"}, ...]} posted to a game, return (answers, player,
+    outcome, number of answers played)
+    """
+    answers = list(json.loads(request.body.decode())['answers'])
+    return (answers, *engine.play_batch(quiz_id, player_id, answers))
+
+
+# /quizer/game/player_id/quiz_id/difficulty/update/batch/
+def update_game_batch(request, player_id, quiz_id, selected_difficulty):
+    """Play a JSON batch of buffered answers and return the final state of the game"""
+    try:
+        answers, player, outcome, played = play_answers(request, quiz_id, player_id)
+    except (KeyError, TypeError, ValueError) as error:
+        return HttpResponseBadRequest(str(error))
+    data = game_data(player, outcome)
+    data['played'] = played
+    return JsonResponse(data)
+
+
+# /quizer/game/player_id/quiz_id/difficulty/check-answers/
+def check_answers(request, player_id, quiz_id, selected_difficulty):
+    """
+    Play a JSON batch of answers like update_game_batch and tell whether each
+    answer played was correct; a checked answer is an answer of the game
+    """
+    try:
+        answers, player, outcome, played = play_answers(request, quiz_id, player_id)
+    except (KeyError, TypeError, ValueError) as error:
+        return HttpResponseBadRequest(str(error))
+    quiz = content.get(quiz_id)
+    data = game_data(player, outcome)
+    data['played'] = played
+    data['results'] = [{'question_number': int(answer['question_number']),
+                        'choice_id': int(answer['choice_id']),
+                        'correct': quiz.choice_value(answer['choice_id']) == CHOICE_VALUE['correct'],
+                        }
+                       for answer in answers[:played]]
+    return JsonResponse(data)
 
 
 # game/<int:player_id>/<int:quiz_id>/<int:selected_difficulty>/quit/
 def quit_game(request, player_id, quiz_id, selected_difficulty):
     quiz = get_object_or_404(Quiz, pk=quiz_id)
     player = quiz.player_set.get(pk=player_id)
+    game_state.delete(player.id)
     if player.name in PLAYERS_FOR_TESTING:
         return redirect(reverse('quizer_game:index'))
-    player.delete()
+    leaderboards.discard(player)
+    with transaction.atomic():
+        player.delete()
+        if player.is_achieved:
+            counters.remove_finisher(quiz.id)
     return redirect(reverse('quizer_game:index'))
 
 
 def upvote_downvote(request, player_id, quiz_id, selected_difficulty, code):
-    quiz = get_object_or_404(Quiz, pk=quiz_id)
-    player = quiz.player_set.get(pk=player_id)
-    if player.has_vote:
-        if code == 0:
-            quiz.downvotes += 1
-            quiz.save()
-        else:
-            quiz.upvotes += 1
-            quiz.save()
-        player.has_vote = False
-        player.save()
+    player = get_object_or_404(Player.objects.only('id', 'selected_difficulty'),
+                               pk=player_id, quiz_id=quiz_id)
+    if counters.vote(quiz_id, player.id, is_upvote=code != 0):
+        page_cache.invalidate()
     return redirect(reverse('quizer_game:result',
-                            kwargs={'player_id': player.id, 'quiz_id': quiz.id,
+                            kwargs={'player_id': player.id, 'quiz_id': quiz_id,
                                     'selected_difficulty': player.selected_difficulty, }
                             )
                     )
 
 
+def result_last_modified(request, player_id, quiz_id, selected_difficulty):
+    """Last change of the player or the quiz, read once per request for both validators"""
+    if not hasattr(request, 'result_updated_at'):
+        updated_at = Player.objects.filter(pk=player_id, quiz_id=quiz_id).values_list(
+            'updated_at', 'quiz__updated_at').first()
+        request.result_updated_at = max(updated_at) if updated_at else None
+    return request.result_updated_at
+
+
+def result_etag(request, player_id, quiz_id, selected_difficulty):
+    updated_at = result_last_modified(request, player_id, quiz_id, selected_difficulty)
+    return str(updated_at.timestamp()) if updated_at else None
+
+
 # game/<int:player_id>/<int:quiz_id>/<int:selected_difficulty>/result/
+@condition(etag_func=result_etag, last_modified_func=result_last_modified)
 def result(request, player_id, quiz_id, selected_difficulty):
     quiz = get_object_or_404(Quiz, pk=quiz_id)
     player = quiz.player_set.get(pk=player_id)
@@ -289,20 +395,98 @@ def result(request, player_id, quiz_id, selected_difficulty):
     return render(request, 'quizer_game/result.html', context)
   
   
+def leaderboard_page(request, quiz_id, selected_difficulty):
+    """
+    Return (first rank, players, next cursor) of the leaderboard page
+    requested by the `after` cursor in the query string, read once per
+    request for both the page and its ETag
+    """
+    if not hasattr(request, 'leaderboard_page'):
+        after = request.GET.get('after')
+        if after is not None:
+            after = leaderboards.decode_cursor(after)
+        board = leaderboards.get(quiz_id, selected_difficulty)
+        start_rank, players = board.page(after=after, size=LEADERBOARD_PAGE_SIZE + 1)
+        next_cursor = None
+        if len(players) > LEADERBOARD_PAGE_SIZE:
+            players = players[:LEADERBOARD_PAGE_SIZE]
+            next_cursor = leaderboards.encode_cursor(players[-1])
+        request.leaderboard_page = start_rank, players, next_cursor
+    return request.leaderboard_page
+
+
+def leaderboard_etag(request, quiz_id, selected_difficulty):
+    """
+    Digest of what the page shows, taken from the same in-process board as
+    the page, so a process with an older board never answers 304 for a newer page
+    """
+    topic = Quiz.objects.filter(pk=quiz_id).values_list('topic', flat=True).first()
+    if topic is None:
+        return None
+    try:
+        start_rank, players, next_cursor = leaderboard_page(request, quiz_id, selected_difficulty)
+    except ValueError:
+        return None
+    rows = [(player.id, player.name, player.time, player.total_answer) for player in players]
+    page = repr((topic, start_rank, rows, next_cursor, nav_user(request)))
+    return hashlib.md5(page.encode()).hexdigest()
+
+
+# /quizer/leaderboard/quiz_id/difficulty/?after=cursor
+@replica_reads
+@condition(etag_func=leaderboard_etag)
 def leaderboard(request, quiz_id, selected_difficulty):
     quiz = get_object_or_404(Quiz, pk=quiz_id)
-    players = quiz.player_set.filter(selected_difficulty=selected_difficulty,
-                                     is_achieved=True)
-    players = players.order_by('time')
-    # number = range(1, player.id+1)
+    try:
+        start_rank, players, next_cursor = leaderboard_page(request, quiz.id, selected_difficulty)
+    except ValueError:
+        return HttpResponseBadRequest('Invalid cursor')
     context = {'quiz': quiz,
                'players': players,
+               'rank_offset': start_rank - 1,
+               'next_cursor': next_cursor,
+               'selected_difficulty': selected_difficulty,
                'difficulty': DIFFICULTY_NUM[selected_difficulty],
                }
 
     return render(request, 'quizer_game/leaderboard.html', context)
 
 
+# /quizer/leaderboard/quiz_id/difficulty/data/?after=cursor
+@replica_reads
+def leaderboard_data(request, quiz_id, selected_difficulty):
+    quiz = get_object_or_404(Quiz, pk=quiz_id)
+    try:
+        start_rank, players, next_cursor = leaderboard_page(request, quiz.id, selected_difficulty)
+    except ValueError:
+        return HttpResponseBadRequest('Invalid cursor')
+    rows = [{'rank': rank,
+             'name': player.name,
+             'time': player.time.total_seconds(),
+             'total_answer': player.total_answer,
+             }
+            for rank, player in enumerate(players, start=start_rank)]
+    return JsonResponse({'players': rows, 'next': next_cursor})
+
+
+# /quizer/leaderboard/quiz_id/difficulty/live/
+def leaderboard_live(request, quiz_id, selected_difficulty):
+    """Server-Sent Events stream of the players reaching the finish line"""
+    get_object_or_404(Quiz.objects.only('id'), pk=quiz_id)
+    events = live.open_stream(quiz_id, selected_difficulty)
+    if events is None:
+        # every stream slot of this process is taken, the page keeps working without updates
+        retry_seconds = getattr(settings, 'LIVE_STREAM_SECONDS', live.DEFAULT_STREAM_SECONDS)
+        response = HttpResponse(f'retry: {retry_seconds * 1000}\n\n', content_type='text/event-stream', status=503)
+        response['Retry-After'] = retry_seconds
+        return response
+    response = StreamingHttpResponse(events, content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # ask nginx not to buffer the stream
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
 # /quizer/create-quiz/
 def create_quiz(request):
     template_name = 'quizer_game/create-question.html'
@@ -312,55 +496,39 @@ def create_quiz(request):
         return render(request, 'quizer_game/login_result.html')
 
 
-# /quizer/create-quiz/update/
-def update_create_quiz(request):
-    quiz_topic = request.POST.get('quiz_topic')
-    quiz = Quiz(topic=quiz_topic, user_id=request.user.id)
-    quiz.save()
-    count_question = 0
-    count_choice = 0
-
-    # update question text from input
-    for i in range(1, 21):
-        question_text = request.POST.get(f'question_text_{i}')
+def create_questions(quiz, questions) -> None:
+    """Insert `questions` read by `read_quiz_data` and their choices with two bulk inserts"""
+    Question.objects.bulk_create(Question(quiz=quiz, text=text, number=number)
+                                 for number, (text, choices) in enumerate(questions, start=1))
+    question_ids = dict(quiz.question_set.values_list('number', 'id'))
+    Choice.objects.bulk_create(Choice(question_id=question_ids[number], text=text, value=value)
+                               for number, (question_text, choices) in enumerate(questions, start=1)
+                               for text, value in choices)
 
-        # check that user set question text
-        if len(question_text) != 0:
-            count_question = count_question + 1
-        question = quiz.question_set.create(text=question_text, number=i)
-
-        # update choice text from input
-        for j in range(1, 5):
-            choice_text = request.POST[f'{i}_choice_text_{j}']
-
-            # check that user set choice text
-            if len(choice_text) != 0:
-                count_choice = count_choice  + 1
-            choice_value = request.POST[f'{i}_choice_value']
-            choice = question.choice_set.create(text=choice_text)
-
-            # check the right choice
-            if choice_value == f"choice{j}":
-                choice.value = 1
-                choice.save()
 
+# /quizer/create-quiz/update/
+def update_create_quiz(request):
     # check that user set 20 questions and 80 choices
-    if count_question == 20 and count_choice == 80:
-        messages.success(request, 'Successful saving')
-        user_ip = get_client_ip(request)
-        username = request.user.username
-        logger.info(f"{user_ip} {username} successfully created quiz")
-        return redirect(reverse('quizer_game:create-question-set'))
-    else:
+    questions = read_quiz_data(request.POST)
+    if questions is None:
         messages.error(request, 'Unsuccessful saving!! You must set 20 questions and 4 choices')
-        quiz.delete()
         return redirect(reverse('quizer_game:create-question-set'))
 
+    with transaction.atomic():
+        quiz = Quiz.objects.create(topic=request.POST.get('quiz_topic'), user_id=request.user.id)
+        create_questions(quiz, questions)
+
+    messages.success(request, 'Successful saving')
+    user_ip = get_client_ip(request)
+    username = request.user.username
+    logger.info(f"{user_ip} {username} successfully created quiz")
+    return redirect(reverse('quizer_game:create-question-set'))
+
 
 # /quizer/edit-quiz/quiz_id/
 def edit_quiz(request, quiz_id):
     template_name = 'quizer_game/edit-question-set.html'
-    quiz = get_object_or_404(Quiz, pk=quiz_id)
+    quiz = get_object_or_404(Quiz.objects.prefetch_related(*quiz_tree_prefetch()), pk=quiz_id)
     context = {'quiz': quiz}
     if request.user.is_authenticated:
         return render(request, template_name, context)
@@ -368,50 +536,78 @@ def edit_quiz(request, quiz_id):
         return render(request, 'quizer_game/login_result.html')
 
       
-# /quizer/edit-quiz/quiz_id/update/
-def edit_data(request, quiz_id):
-    quiz = get_object_or_404(Quiz, pk=quiz_id)
-    quiz.topic = request.POST.get('quiz_topic')
-    quiz.save()
-
-    question = quiz.question_set.all()
-    print(question)
-    count_question = 0
+def edit_questions(quiz, data) -> dict:
+    """
+    Apply the posted edit form `data` to a quiz loaded with `quiz_tree_prefetch`,
+    save only the rows that changed and return how many of them changed
+    """
+    changed_questions = []
+    changed_choices = []
+    topic = data.get('quiz_topic', quiz.topic)
+    topic_changed = topic != quiz.topic
+    quiz.topic = topic
 
     # update question text from input
-    for i in quiz.question_set.all():
-        count_question = count_question + 1
-        i.text = request.POST[f'question_text_{count_question}']
-        i.save()
-        count_choice = 0
+    for count_question, question in enumerate(quiz.question_set.all(), start=1):
+        question_text = data.get(f'question_text_{count_question}', question.text)
+        if question_text != question.text:
+            question.text = question_text
+            changed_questions.append(question)
+        choice_value = data.get(f'{count_question}_choice_value')
 
         # update choice text from input
-        for j in i.choice_set.all():
-            count_choice = count_choice + 1
-            j.text = request.POST[f'{count_question}_choice_text_{count_choice}']
-            choice_value = request.POST[f'{count_question}_choice_value']
+        for count_choice, choice in enumerate(question.choice_set.all(), start=1):
+            choice_text = data.get(f'{count_question}_choice_text_{count_choice}', choice.text)
 
             # check the right choice
-            if int(choice_value) == int(count_choice):
-                j.value = 1
+            if choice_value is None:
+                value = choice.value
+            elif int(choice_value) == count_choice:
+                value = CHOICE_VALUE['correct']
             else:
-                j.value = 0
-            j.save()
+                value = CHOICE_VALUE['wrong']
+
+            if choice_text != choice.text or value != choice.value:
+                choice.text = choice_text
+                choice.value = value
+                changed_choices.append(choice)
+
+    if topic_changed:
+        quiz.save(update_fields=['topic', 'updated_at'])
+    Question.objects.bulk_update(changed_questions, ['text'])
+    Choice.objects.bulk_update(changed_choices, ['text', 'value'])
+    return {'topic': topic_changed,
+            'questions': len(changed_questions),
+            'choices': len(changed_choices),
+            }
+
+
+# /quizer/edit-quiz/quiz_id/update/
+def edit_data(request, quiz_id):
+    with transaction.atomic():
+        quiz = get_object_or_404(Quiz.objects.prefetch_related(*quiz_tree_prefetch()), pk=quiz_id)
+        changes = edit_questions(quiz, request.POST)
+    content.invalidate(quiz.id)
 
     # if user already save it will display successful saving
-    messages.success(request, 'Successful saving')
+    summary = (f"topic {'changed' if changes['topic'] else 'unchanged'}, "
+               f"{changes['questions']} question(s) and {changes['choices']} choice(s) changed")
+    messages.success(request, f'Successful saving ({summary})')
     user_ip = get_client_ip(request)
     username = request.user.username
-    logger.info(f"{user_ip} {username} successfully edited quiz")
+    logger.info(f"{user_ip} {username} successfully edited quiz: {summary}")
     return redirect(reverse('quizer_game:edit_quiz', kwargs={'quiz_id': quiz.id}))
-    
-    
+
+
+@replica_reads
+@page_cache.cached_page
 def quiz_index(request):
     quizzes = Quiz.objects.all()
     context = {'quizzes': quizzes}
     return render(request, 'quizer_game/quiz-index.html', context)  
 
 
+@replica_reads
 def user_profile(request):
     template_name = 'quizer_game/user-profile.html'
     quizzes = Quiz.objects.filter(user_id=request.user.id)
@@ -443,6 +639,12 @@ def update_user_profile(request):
     return redirect(reverse('quizer_game:user_profile'))
 
 
+@staff_member_required
+def request_metrics(request):
+    """Query count and latency histograms of each URL name in this process"""
+    return JsonResponse(metrics.snapshot())
+
+
 # display when normal player try to access the page og register user
 def login_result(request):
     return render(request, 'quizer_game/login_result.html')
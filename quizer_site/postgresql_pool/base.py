@@ -0,0 +1,79 @@
+"""
+PostgreSQL backend that takes its connections from an in-process pool.
+
+Django opens a connection for each request (or keeps one per thread with
+CONN_MAX_AGE). With this backend a closed connection goes back to a
+psycopg2 ThreadedConnectionPool of POOL_SIZE connections shared by the
+threads of the process instead of being closed, so requests stop paying
+the connection setup. Connections left inside a transaction are discarded.
+
+ThreadedConnectionPool raises PoolError as soon as it is empty, so a thread
+first waits up to POOL_TIMEOUT seconds for one of the POOL_SIZE slots of the
+pool; the pool can be smaller than the number of threads.
+"""
+import threading
+
+from django.db.backends.postgresql import base
+from psycopg2 import extensions, pool
+
+DEFAULT_POOL_SIZE = 10
+DEFAULT_POOL_TIMEOUT = 30       # seconds
+
+_pools = {}
+_slots = {}
+_lock = threading.Lock()
+
+
+def get_pool(alias, settings_dict, conn_params):
+    with _lock:
+        connection_pool = _pools.get(alias)
+        if connection_pool is None:
+            size = settings_dict.get('POOL_SIZE') or DEFAULT_POOL_SIZE
+            connection_pool = pool.ThreadedConnectionPool(1, size, **conn_params)
+            _pools[alias] = connection_pool
+            _slots[alias] = threading.BoundedSemaphore(size)
+        return connection_pool
+
+
+def take_slot(alias, settings_dict) -> None:
+    """Wait for a free connection of the pool of `alias`, raise PoolError after POOL_TIMEOUT seconds"""
+    timeout = settings_dict.get('POOL_TIMEOUT', DEFAULT_POOL_TIMEOUT)
+    if not _slots[alias].acquire(timeout=timeout):
+        raise pool.PoolError(f'no connection of the pool was free for {timeout} seconds')
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    def get_new_connection(self, conn_params):
+        connection_pool = get_pool(self.alias, self.settings_dict, conn_params)
+        take_slot(self.alias, self.settings_dict)
+        try:
+            connection = connection_pool.getconn()
+            if connection.closed:
+                # the server closed it while it was in the pool
+                connection_pool.putconn(connection, close=True)
+                connection = connection_pool.getconn()
+        except Exception:
+            _slots[self.alias].release()
+            raise
+
+        # same isolation level handling as the postgresql backend
+        options = self.settings_dict['OPTIONS']
+        try:
+            self.isolation_level = options['isolation_level']
+        except KeyError:
+            self.isolation_level = connection.isolation_level
+        else:
+            if self.isolation_level != connection.isolation_level:
+                connection.set_session(isolation_level=self.isolation_level)
+        return connection
+
+    def _close(self):
+        if self.connection is None:
+            return
+        with self.wrap_database_errors:
+            discard = self.connection.closed or \
+                self.connection.get_transaction_status() != extensions.TRANSACTION_STATUS_IDLE
+            try:
+                _pools[self.alias].putconn(self.connection, close=bool(discard))
+            finally:
+                _slots[self.alias].release()
@@ -11,7 +11,7 @@ https://docs.djangoproject.com/en/2.2/ref/settings/
 """
 
 import os
-from decouple import config
+from decouple import config, Csv
 import logging.config
 from django.utils.log import DEFAULT_LOGGING
 import django_heroku
@@ -69,11 +69,13 @@ AUTHENTICATION_BACKENDS = (
 )
 
 MIDDLEWARE = [
+    'quizer_game.metrics.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'quizer_game.routers.ReplicaRoutingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     # 'whitenoise.middleware.WhiteNoiseMiddleware',
@@ -83,7 +85,8 @@ ROOT_URLCONF = 'quizer_site.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        # DjangoTemplates that reports render time to the request metrics
+        'BACKEND': 'quizer_game.metrics.TimedDjangoTemplates',
         'DIRS': [],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -154,6 +157,51 @@ STATICFILES_DIRS = [os.path.join(BASE_DIR, 'quizer_game', 'static'), ]
 
 # STATICFILES_STORAGE = 'whitenoise.storage.CompressedStaticFilesStorage'
 
+
+# Quizer game
+
+# seconds before an in-process leaderboard is reloaded from the database
+LEADERBOARD_REFRESH_SECONDS = config('LEADERBOARD_REFRESH_SECONDS', default=60, cast=int)
+# in-process leaderboards kept per worker, the least recently read is dropped first
+LEADERBOARD_CACHE_SIZE = config('LEADERBOARD_CACHE_SIZE', default=256, cast=int)
+
+# in-process cache of quiz content, QUIZ_CONTENT_CACHE is an optional shared cache alias
+QUIZ_CONTENT_CACHE = config('QUIZ_CONTENT_CACHE', default=None)
+QUIZ_CONTENT_CACHE_SIZE = config('QUIZ_CONTENT_CACHE_SIZE', default=128, cast=int)
+QUIZ_CONTENT_CACHE_TIMEOUT = config('QUIZ_CONTENT_CACHE_TIMEOUT', default=300, cast=int)
+
+# cache alias of pages that only change with quizzes (empty to turn it off) and their timeout
+PAGE_CACHE = config('PAGE_CACHE', default='default')
+PAGE_CACHE_TIMEOUT = config('PAGE_CACHE_TIMEOUT', default=300, cast=int)
+
+# live leaderboard streams: seconds between keep-alive comments and before a stream
+# is closed (browsers reconnect), streams open at once per process (each holds a
+# gunicorn thread, keep it below GUNICORN_THREADS), LIVE_BROKER is an optional broker class path
+LIVE_KEEPALIVE_SECONDS = config('LIVE_KEEPALIVE_SECONDS', default=15, cast=int)
+LIVE_STREAM_SECONDS = config('LIVE_STREAM_SECONDS', default=300, cast=int)
+LIVE_MAX_STREAMS = config('LIVE_MAX_STREAMS', default=4, cast=int)
+LIVE_BROKER = config('LIVE_BROKER', default='quizer_game.live.LocalBroker')
+
+# per URL name query and latency histograms (see /metrics/), and a Server-Timing header
+REQUEST_METRICS = config('REQUEST_METRICS', default=True, cast=bool)
+SERVER_TIMING = config('SERVER_TIMING', default=False, cast=bool)
+
+# max-age of the question pack of a quiz, its ETag changes when the quiz is edited
+QUESTION_PACK_MAX_AGE = config('QUESTION_PACK_MAX_AGE', default=86400, cast=int)
+
+# cache alias that keeps games in progress, unset to write every answer to the database;
+# it must be shared by the worker processes (memcached, redis or file based, not local memory)
+GAME_STATE_CACHE = config('GAME_STATE_CACHE', default=None)
+GAME_STATE_TIMEOUT = config('GAME_STATE_TIMEOUT', default=3600, cast=int)
+
+# seconds without an answer before expire_games fails an easy or medium game
+GAME_IDLE_TIMEOUT = config('GAME_IDLE_TIMEOUT', default=1800, cast=int)
+
+# days before archive_players moves failed and timed out players to the archive,
+# and days the archive keeps them (0 keeps them forever)
+PLAYER_ARCHIVE_AFTER_DAYS = config('PLAYER_ARCHIVE_AFTER_DAYS', default=7, cast=int)
+PLAYER_ARCHIVE_RETENTION_DAYS = config('PLAYER_ARCHIVE_RETENTION_DAYS', default=365, cast=int)
+
 LOGGING_CONFIG = None
 logging.config.dictConfig({
     'version': 1,
@@ -199,10 +247,42 @@ logging.config.dictConfig({
 })
 
 
+# seconds a connection is kept open between requests (0 closes it after each request);
+# every gunicorn thread keeps one, so the app holds up to WEB_CONCURRENCY x GUNICORN_THREADS
+# connections per database (2 x 8 by default, see gunicorn.conf.py) which must stay below
+# the database's connection limit, lower GUNICORN_THREADS or set DB_POOL_SIZE otherwise;
+# size of the in-process PostgreSQL pool (0 for no pool) and seconds a thread waits for
+# a free pooled connection, SQLite lock wait in seconds
+DB_CONN_MAX_AGE = config('DB_CONN_MAX_AGE', default=600, cast=int)
+DB_POOL_SIZE = config('DB_POOL_SIZE', default=0, cast=int)
+DB_POOL_TIMEOUT = config('DB_POOL_TIMEOUT', default=30, cast=int)
+DB_SQLITE_BUSY_TIMEOUT = config('DB_SQLITE_BUSY_TIMEOUT', default=5, cast=int)
+DB_SQLITE_WAL = config('DB_SQLITE_WAL', default=True, cast=bool)
+
 if 'IS_HEROKU' in os.environ:
     DATABASES = {}
-    DATABASES['default'] = dj_database_url.config(conn_max_age=600)
+    DATABASES['default'] = dj_database_url.config(conn_max_age=DB_CONN_MAX_AGE)
     django_heroku.settings(locals())
     del DATABASES['default']['OPTIONS']['sslmode']
 else:
-    DATABASES = {'default': dj_database_url.config(default='sqlite:///db.sqlite3')}
+    DATABASES = {'default': dj_database_url.config(default='sqlite:///db.sqlite3', conn_max_age=DB_CONN_MAX_AGE)}
+
+# read replicas of the default database, used by leaderboard and listing views;
+# a client reads from the primary for REPLICA_PIN_SECONDS after it writes (signed cookie)
+DATABASE_REPLICAS = []
+for number, url in enumerate(config('DATABASE_REPLICA_URLS', default='', cast=Csv()), start=1):
+    DATABASES[f'replica{number}'] = dj_database_url.parse(url, conn_max_age=DB_CONN_MAX_AGE)
+    DATABASES[f'replica{number}']['TEST'] = {'MIRROR': 'default'}
+    DATABASE_REPLICAS.append(f'replica{number}')
+DATABASE_ROUTERS = ['quizer_game.routers.ReplicaRouter']
+REPLICA_PIN_SECONDS = config('REPLICA_PIN_SECONDS', default=10, cast=int)
+
+for database in DATABASES.values():
+    if database['ENGINE'] == 'django.db.backends.sqlite3':
+        database.setdefault('OPTIONS', {})['timeout'] = DB_SQLITE_BUSY_TIMEOUT
+    elif database['ENGINE'].startswith('django.db.backends.postgresql') and DB_POOL_SIZE:
+        database['ENGINE'] = 'quizer_site.postgresql_pool'
+        database['POOL_SIZE'] = DB_POOL_SIZE
+        database['POOL_TIMEOUT'] = DB_POOL_TIMEOUT
+        # connections go back to the pool at the end of each request
+        database['CONN_MAX_AGE'] = 0